@@ -1,13 +1,19 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import utils
 import json
+import bisect
 import theses_manager
 import os
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
+from datetime import date
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from agent import StockAgent
 
 
@@ -17,6 +23,14 @@ load_dotenv()
 # Page Configuration
 st.set_page_config(page_title="Investment Dashboard", layout="wide", initial_sidebar_state="expanded")
 
+# Above this many bars the price chart switches from candlesticks to a WebGL band
+CANDLESTICK_MAX_BARS = 1500
+
+# Journal urgency buckets by days left until the check-by date: < 0, < 30, otherwise
+URGENCY_THRESHOLDS = (0, 30)
+URGENCY_COLORS = ("red", "orange", "green")
+URGENCY_LABEL_FORMATS = ("{date} (Expired)", "{date} ({days} days left)", "{date}")
+
 # --- Helper Functions ---
 def create_compact_bar_chart(x_data, y_data, title, color):
     """
@@ -67,6 +81,83 @@ def create_compact_bar_chart(x_data, y_data, title, color):
     )
     return fig
 
+# The only info fields compute_summary reads
+SUMMARY_FIELDS = ('currentPrice', 'previousClose', 'dayLow', 'dayHigh', 'volume',
+                  'marketCap', 'trailingEps', 'grossProfits', 'revenueGrowth')
+
+@st.cache_data(show_spinner=False, ttl=60, max_entries=256)
+def compute_summary(ticker_symbol, fields):
+    """
+    Pre-formats the headline metric strings for a ticker.
+    fields holds the (key, value) pairs of SUMMARY_FIELDS present in info, so the cache
+    key is those few values rather than the whole info dict. The TTL matches the quote cache.
+    """
+    info = dict(fields)
+    curr_price = info.get('currentPrice', 0)
+    prev_close = info.get('previousClose', curr_price)
+    delta = curr_price - prev_close
+    delta_pct = (delta / prev_close) if prev_close else 0
+    
+    return {
+        "price": f"${curr_price:.2f}",
+        "delta": f"{delta:.2f} ({delta_pct*100:.2f}%)",
+        "range": f"${info.get('dayLow', 0)} - ${info.get('dayHigh', 0)}",
+        "volume": utils.format_large_number(info.get('volume', 0)),
+        "market_cap": utils.format_large_number(info.get('marketCap', 0)),
+        "eps": f"{info.get('trailingEps', 'N/A')}",
+        "gross_profit": utils.format_large_number(info.get('grossProfits', 0)) if 'grossProfits' in info else "N/A",
+        "revenue_growth": f"{info.get('revenueGrowth', 0)*100:.2f}%" if info.get('revenueGrowth') else "N/A",
+    }
+
+# Only the current file version is worth keeping; older entries would pin stale lists
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_theses_cached(mtime_ns):
+    """
+    Loads theses from disk, cached per file modification time.
+    Any save/delete bumps the mtime, so reruns only re-read after a change.
+    cache_data hands out copies, so the read-only (uncopied) list is safe here.
+    """
+    return theses_manager.load_theses(readonly=True)
+
+def get_all_theses():
+    """Returns the journal's theses, served from memory while the file is unchanged."""
+    try:
+        mtime_ns = os.stat(theses_manager.THESES_FILE).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return load_theses_cached(mtime_ns) or []
+
+def make_executor(max_workers):
+    """
+    ThreadPoolExecutor whose worker threads carry the current Streamlit script context,
+    so st.cache_data helpers can be called from them.
+    """
+    ctx = get_script_run_ctx()
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx))
+
+# --- Cached Data Layer (keyed by ticker, shared across reruns) ---
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_earnings_dates(ticker_symbol):
+    return utils.get_earnings_dates(ticker_symbol)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_polymarket_data(ticker_symbol, company_name, has_key, _api_key):
+    """
+    Prediction markets for a ticker. The API key itself is excluded from the cache key,
+    but has_key is part of it: with a key the search adds AI branding keywords.
+    """
+    extra_kws = StockAgent(_api_key, ticker_symbol).get_branding_keywords() if has_key else []
+    return utils.get_polymarket_data(ticker_symbol, company_name, extra_kws)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_competitor_data(tickers):
+    return utils.get_competitor_data(list(tickers))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_competitor_history(tickers):
+    return utils.get_competitor_history(list(tickers))
+
 # --- Page Rendering Functions ---
 
 def render_dashboard(api_key, ticker_symbol):
@@ -90,7 +181,8 @@ def render_dashboard(api_key, ticker_symbol):
     # --- Data Fetching Logic ---
     if get_data_btn:
         with st.spinner(f"Fetching data for {ticker_symbol}..."):
-            ticker, error = utils.get_stock_data(ticker_symbol)
+            # Stock lookup, news and history don't depend on each other: fetch them together
+            (ticker, error), prefetched_news, prefetched_hist = utils.prefetch_ticker(ticker_symbol)
             
             if error:
                 st.error(f"Error: {error}")
@@ -98,33 +190,39 @@ def render_dashboard(api_key, ticker_symbol):
             else:
                 st.session_state['ticker_obj'] = ticker
                 st.session_state['info'] = ticker.info
-                st.session_state['news'] = utils.get_news(ticker_symbol) 
-                st.session_state['financials'] = utils.get_financials(ticker)
-                
-                history_df = utils.get_historical_data(ticker)
-                st.session_state['history_df'] = utils.calculate_momentum(history_df)
-                
-                st.session_state['signals'] = utils.analyze_investment_signals(st.session_state['info'], st.session_state['history_df'])
                 
-                # Pre-fetch PE Band data (instead of during render)
-                st.session_state['pe_band_df'] = utils.get_pe_band_data(ticker_symbol)
-                
-                st.session_state['segments_json'] = "[]"
-                st.session_state['core_driver'] = "N/A"
+                # The remaining fetches are independent network calls, so run them side by side
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    f_fin = executor.submit(utils.get_financials, ticker)
+                    # Pre-fetch PE Band data (instead of during render)
+                    f_pe = executor.submit(utils.get_pe_band_data, ticker_symbol)
+                    f_seg = executor.submit(utils.search_revenue_segments, ticker_symbol) if api_key else None
+                    
+                    # Momentum & signals only need history + info; compute while the rest is in flight
+                    st.session_state['history_df'] = utils.calculate_momentum(prefetched_hist)
+                    st.session_state['signals'] = utils.analyze_investment_signals(st.session_state['info'], st.session_state['history_df'])
+                    
+                    st.session_state['news'] = prefetched_news
+                    st.session_state['financials'] = f_fin.result()
+                    st.session_state['pe_band_df'] = f_pe.result()
                 
-                if api_key:
-                    print(f"DEBUG: Initializing Agent for {ticker_symbol}...")
-                    agent = StockAgent(api_key, ticker_symbol)
-                    # st.session_state['agent'] removed to prevent pickling error
+                    st.session_state['segments_json'] = "[]"
+                    st.session_state['core_driver'] = "N/A"
                     
-                    with st.spinner("Extracting Revenue Segments & Drivers..."):
-                        print(f"DEBUG: Searching revenue segments (DDG)...")
-                        seg_context = utils.search_revenue_segments(ticker_symbol)
-                        print(f"DEBUG: Found {len(seg_context)} raw segments. Extracting (Gemini)...")
-                        st.session_state['segments_json'] = agent.extract_revenue_segments(seg_context)
-                        print(f"DEBUG: Segments extracted. Identifying driver...")
-                        st.session_state['core_driver'] = agent.identify_core_driver(st.session_state['news'])
-                        print(f"DEBUG: Driver identified.")
+                    if api_key:
+                        print(f"DEBUG: Initializing Agent for {ticker_symbol}...")
+                        agent = StockAgent(api_key, ticker_symbol)
+                        # st.session_state['agent'] removed to prevent pickling error
+                        
+                        with st.spinner("Extracting Revenue Segments & Drivers..."):
+                            # Both Gemini calls are independent once their inputs are in
+                            f_driver = executor.submit(agent.identify_core_driver, st.session_state['news'])
+                            seg_context = f_seg.result()
+                            print(f"DEBUG: Found {len(seg_context)} raw segments. Extracting (Gemini)...")
+                            st.session_state['segments_json'] = agent.extract_revenue_segments(seg_context)
+                            print(f"DEBUG: Segments extracted. Waiting on driver...")
+                            st.session_state['core_driver'] = f_driver.result()
+                            print(f"DEBUG: Driver identified.")
 
                 
                 st.session_state['data_loaded'] = True
@@ -139,21 +237,15 @@ def render_dashboard(api_key, ticker_symbol):
         signals = st.session_state['signals']
         segments_json = st.session_state.get('segments_json', '[]')
         core_driver = st.session_state.get('core_driver', 'N/A')
+        summary = compute_summary(ticker_symbol, tuple((k, info[k]) for k in SUMMARY_FIELDS if k in info))
         
         # --- First Screen: Compact & Visual ---
         col_metrics, col_summary = st.columns([1, 2])
         
         with col_metrics:
-            curr_price = info.get('currentPrice', 0)
-            prev_close = info.get('previousClose', curr_price)
-            delta = curr_price - prev_close
-            delta_pct = (delta / prev_close) if prev_close else 0
-            
-            st.metric(label="Current Price", value=f"${curr_price:.2f}", delta=f"{delta:.2f} ({delta_pct*100:.2f}%)")
-            st.write(f"**Range:** ${info.get('dayLow', 0)} - ${info.get('dayHigh', 0)}")
-            
-            vol_str = utils.format_large_number(info.get('volume', 0))
-            st.write(f"**Vol:** {vol_str}")
+            st.metric(label="Current Price", value=summary['price'], delta=summary['delta'])
+            st.write(f"**Range:** {summary['range']}")
+            st.write(f"**Vol:** {summary['volume']}")
             
         with col_summary:
             st.subheader("💡 Analysis")
@@ -173,9 +265,17 @@ def render_dashboard(api_key, ticker_symbol):
                                 row_heights=[0.5, 0.2, 0.3],
                                 subplot_titles=("Price Trend (SMA 50/200)", "Volume", "Momentum (RSI)"))
 
-            fig.add_trace(go.Candlestick(x=history_df.index,
-                            open=history_df['Open'], high=history_df['High'],
-                            low=history_df['Low'], close=history_df['Close'], name='Price'), row=1, col=1)
+            # float32 keeps the serialized figure payload smaller
+            price_df = history_df[['Open', 'High', 'Low', 'Close']].astype(np.float32)
+            if len(history_df) > CANDLESTICK_MAX_BARS:
+                # Long histories: WebGL high/low band + close line instead of one SVG group per candle
+                fig.add_trace(go.Scattergl(x=history_df.index, y=price_df['High'], line=dict(width=0), showlegend=False, name='High'), row=1, col=1)
+                fig.add_trace(go.Scattergl(x=history_df.index, y=price_df['Low'], fill='tonexty', fillcolor='rgba(128,128,128,0.2)', line=dict(width=0), showlegend=False, name='Low'), row=1, col=1)
+                fig.add_trace(go.Scattergl(x=history_df.index, y=price_df['Close'], line=dict(color='gray', width=1), name='Price'), row=1, col=1)
+            else:
+                fig.add_trace(go.Candlestick(x=history_df.index,
+                                open=price_df['Open'], high=price_df['High'],
+                                low=price_df['Low'], close=price_df['Close'], name='Price'), row=1, col=1)
             fig.add_trace(go.Scatter(x=history_df.index, y=history_df['SMA_50'], line=dict(color='orange', width=1), name='SMA 50'), row=1, col=1)
             fig.add_trace(go.Scatter(x=history_df.index, y=history_df['SMA_200'], line=dict(color='blue', width=1), name='SMA 200'), row=1, col=1)
 
@@ -186,7 +286,7 @@ def render_dashboard(api_key, ticker_symbol):
             fig.add_hline(y=70, line_dash="dash", line_color="red", row=3, col=1)
             fig.add_hline(y=30, line_dash="dash", line_color="green", row=3, col=1)
             
-            fig.update_layout(height=800, xaxis_rangeslider_visible=False, showlegend=False)
+            fig.update_layout(height=800, xaxis_rangeslider_visible=False, showlegend=False, uirevision=ticker_symbol)
             fig.update_yaxes(title_text="Price", row=1, col=1)
             fig.update_yaxes(title_text="Vol", row=2, col=1)
             fig.update_yaxes(title_text="RSI", range=[0, 100], row=3, col=1)
@@ -251,54 +351,62 @@ def render_dashboard(api_key, ticker_symbol):
         tab_news, tab_fin, tab_comp, tab_thesis = st.tabs(["📰 AI News Insights", "💰 Financials Deep Dive", "⚔️ Competitors", "🧘 Thesis Tracker"])
         
         with tab_news:
-            if api_key:
-                # Executive Summary merged into Strategic Intelligence above.
-                
-                # Use columns to put header and source info side-by-side
-                col_ev_head, col_ev_src = st.columns([0.85, 0.15])
-                with col_ev_head:
-                    st.subheader("🗓️ Major Events Timeline")
-                with col_ev_src:
-                    # Provide source attribution in a popover
-                    confirmed_dates = utils.get_earnings_dates(ticker_symbol)
-                    source_name = confirmed_dates.get('source', 'yfinance/FMP')
-                    with st.popover("ℹ️ Source"):
-                        st.markdown(f"**Data Sources:**")
-                        st.markdown(f"- **Confirmed Dates**: {source_name}")
-                        st.markdown("- **Highlights**: AI News Search (DuckDuckGo)")
-                        st.caption("AI-generated summaries may contain errors.")
-
-                with st.spinner("Identifying Key Events & Catalysts..."):
-                     if 'evt_summary' not in st.session_state:
-                          evt_context = utils.search_key_events(ticker_symbol)
-                          # confirmed_dates already fetched above
-                          agent = StockAgent(api_key, ticker_symbol)
-                          st.session_state['evt_summary'] = agent.analyze_events(evt_context, confirmed_dates)
-                     st.markdown(st.session_state['evt_summary'])
-
-                     
-            else:
-                st.warning("⚠️ Enter Gemini API Key in sidebar to unlock AI Summary.")
+            # Dispatch the network-bound fetches up front so they overlap instead of running back-to-back
+            news_agent = StockAgent(api_key, ticker_symbol) if api_key else None
+            news_executor = make_executor(max_workers=3)
+            try:
+                def fetch_events_summary():
+                    evt_context = utils.search_key_events(ticker_symbol)
+                    return news_agent.analyze_events(evt_context, f_dates.result())
             
-            st.divider()
-            st.subheader("🎲 Prediction Markets (Polymarket)")
-            with st.spinner("Fetching Betting Markets..."):
-                extra_kws = []
+                f_poly = news_executor.submit(fetch_polymarket_data, ticker_symbol, info.get('shortName'), bool(api_key), api_key)
                 if api_key:
-                    agent = StockAgent(api_key, ticker_symbol)
-                    extra_kws = agent.get_branding_keywords()
-                
-                poly_markets = utils.get_polymarket_data(ticker_symbol, info.get('shortName'), extra_kws)
+                    f_dates = news_executor.submit(fetch_earnings_dates, ticker_symbol)
+                    if 'evt_summary' not in st.session_state:
+                        f_evt = news_executor.submit(fetch_events_summary)
+            
+                if api_key:
+                    # Executive Summary merged into Strategic Intelligence above.
+                
+                    # Use columns to put header and source info side-by-side
+                    col_ev_head, col_ev_src = st.columns([0.85, 0.15])
+                    with col_ev_head:
+                        st.subheader("🗓️ Major Events Timeline")
+                    with col_ev_src:
+                        # Provide source attribution in a popover
+                        confirmed_dates = f_dates.result()
+                        source_name = confirmed_dates.get('source', 'yfinance/FMP')
+                        with st.popover("ℹ️ Source"):
+                            st.markdown(f"**Data Sources:**")
+                            st.markdown(f"- **Confirmed Dates**: {source_name}")
+                            st.markdown("- **Highlights**: AI News Search (DuckDuckGo)")
+                            st.caption("AI-generated summaries may contain errors.")
+
+                    with st.spinner("Identifying Key Events & Catalysts..."):
+                         if 'evt_summary' not in st.session_state:
+                              st.session_state['evt_summary'] = f_evt.result()
+                         st.markdown(st.session_state['evt_summary'])
 
-                
-                if poly_markets:
-                    for m in poly_markets:
-                        st.markdown(f"**[{m['title']}]({m['url']})**")
-                        c1, c2 = st.columns([1, 2])
-                        c1.caption(f"💴 Volume: ${utils.format_large_number(m['volume'])}")
-                        c2.caption(f"📊 Odds: {m['odds']}")
+                     
                 else:
-                    st.info("No active prediction markets found for this ticker.")
+                    st.warning("⚠️ Enter Gemini API Key in sidebar to unlock AI Summary.")
+            
+                st.divider()
+                st.subheader("🎲 Prediction Markets (Polymarket)")
+                with st.spinner("Fetching Betting Markets..."):
+                    poly_markets = f_poly.result()
+                
+                    if poly_markets:
+                        for m in poly_markets:
+                            st.markdown(f"**[{m['title']}]({m['url']})**")
+                            c1, c2 = st.columns([1, 2])
+                            c1.caption(f"💴 Volume: ${utils.format_large_number(m['volume'])}")
+                            c2.caption(f"📊 Odds: {m['odds']}")
+                    else:
+                        st.info("No active prediction markets found for this ticker.")
+            finally:
+                # Runs on errors too, so a failed fetch or render never leaks the pool's threads
+                news_executor.shutdown(wait=False, cancel_futures=True)
             
             st.divider()
             st.subheader("Latest Articles (最新文章)")
@@ -319,14 +427,10 @@ def render_dashboard(api_key, ticker_symbol):
             
             m1, m2, m3, m4 = st.columns(4)
             
-            mcap = utils.format_large_number(info.get('marketCap', 0))
-            gross_profit_val = info.get('grossProfits', 0)
-            gross_profit = utils.format_large_number(gross_profit_val) if 'grossProfits' in info else "N/A"
-            
-            m1.metric("Market Cap", mcap)
-            m2.metric("Basic EPS", f"{info.get('trailingEps', 'N/A')}")
-            m3.metric("Gross Profit (TTM)", gross_profit)
-            m4.metric("Revenue Growth", f"{info.get('revenueGrowth', 0)*100:.2f}%" if info.get('revenueGrowth') else "N/A")
+            m1.metric("Market Cap", summary['market_cap'])
+            m2.metric("Basic EPS", summary['eps'])
+            m3.metric("Gross Profit (TTM)", summary['gross_profit'])
+            m4.metric("Revenue Growth", summary['revenue_growth'])
 
             st.divider()
             
@@ -370,6 +474,17 @@ def render_dashboard(api_key, ticker_symbol):
                         period_label = sankey_data.get('period', 'Most Recent Quarter')
                         st.subheader(f"🌊 Income Statement Flow ({period_label})")
                         
+                        if 'custom_data' in sankey_data:
+                            link_customdata = sankey_data['custom_data']
+                        else:
+                            link_customdata = [utils.format_large_number(x) for x in sankey_data['value']]
+                        
+                        # Typed arrays let Plotly binary-encode the numeric link data instead of per-element JSON
+                        # (string fields such as labels/colors are serialized as lists either way)
+                        link_source = np.asarray(sankey_data['source'], dtype=np.int32)
+                        link_target = np.asarray(sankey_data['target'], dtype=np.int32)
+                        link_value = np.asarray(sankey_data['value'], dtype=np.float32)
+                        
                         fig_sankey = go.Figure(data=[go.Sankey(
                             node = dict(
                                 pad = 30,
@@ -380,11 +495,11 @@ def render_dashboard(api_key, ticker_symbol):
                                 hovertemplate='<b>%{label}</b><extra></extra>' 
                             ),
                             link = dict(
-                                source = sankey_data['source'],
-                                target = sankey_data['target'],
-                                value = sankey_data['value'],
+                                source = link_source,
+                                target = link_target,
+                                value = link_value,
                                 color = sankey_data['link_color'],
-                                customdata = sankey_data.get('custom_data', [utils.format_large_number(x) for x in sankey_data['value']]),
+                                customdata = link_customdata,
                                 hovertemplate='<b>%{source.label}</b> → <b>%{target.label}</b><br>Value: %{customdata}<extra></extra>'
                             ))])
                         
@@ -399,7 +514,7 @@ def render_dashboard(api_key, ticker_symbol):
                         try:
                             values = pd.to_numeric(values, errors='coerce')
                             if values.dropna().empty: return None
-                            values_m = values / 1e6
+                            values_m = (values / 1e6).round(2)
                             return create_compact_bar_chart(dates, values_m, f"{name} ($M)", color)
                         except Exception as e:
                             return None
@@ -464,7 +579,7 @@ def render_dashboard(api_key, ticker_symbol):
                         all_tickers = [ticker_symbol] + comp_list
                 
                 st.caption("Key Valuation & Performance Metrics")
-                comp_df = utils.get_competitor_data(all_tickers)
+                comp_df = fetch_competitor_data(tuple(all_tickers))
                 if not comp_df.empty:
                     st.dataframe(
                         comp_df.style.format({
@@ -482,8 +597,9 @@ def render_dashboard(api_key, ticker_symbol):
                     st.warning("Could not find competitors or fetch their data.")
                 
                 st.caption("12-Month Relative Performance (%)")
-                hist_df = utils.get_competitor_history(all_tickers)
+                hist_df = fetch_competitor_history(tuple(all_tickers))
                 if not hist_df.empty:
+                    hist_df = hist_df.astype(np.float32)
                     fig_perf = go.Figure()
                     for col in hist_df.columns:
                         width = 3 if col == ticker_symbol else 1.5
@@ -497,7 +613,7 @@ def render_dashboard(api_key, ticker_symbol):
                             line=dict(width=width),
                             opacity=opacity
                         ))
-                    fig_perf.update_layout(xaxis_title="Date", yaxis_title="Return (%)", hovermode="x unified")
+                    fig_perf.update_layout(xaxis_title="Date", yaxis_title="Return (%)", hovermode="x unified", uirevision=ticker_symbol)
                     st.plotly_chart(fig_perf, use_container_width=True)
                 else:
                     st.warning("Could not fetch historical data for comparison.")
@@ -594,12 +710,23 @@ def render_dashboard(api_key, ticker_symbol):
 
             with col_journal:
                 st.subheader(f"📖 Active Theses for {ticker_symbol}")
-                all_theses = theses_manager.load_theses() or []
+                all_theses = get_all_theses()
                 my_theses = [t for t in all_theses if t['ticker'] == ticker_symbol]
                 
                 if not my_theses:
                     st.info("No active theses for this stock.")
                 
+                # Callbacks run before the click's natural rerun, so no explicit st.rerun() is needed
+                def on_delete_thesis(thesis_id):
+                    theses_manager.delete_thesis(thesis_id)
+                
+                def on_edit_thesis(t):
+                    st.session_state["draft_fn_statement"] = t["thesis_statement"]
+                    st.session_state["draft_fn_condition"] = t["falsification_condition"]
+                    st.session_state["draft_fn_horizon"] = t["time_horizon"]
+                    st.session_state["draft_fn_confidence"] = int(t["confidence"])
+                    st.session_state["draft_thesis_id"] = t["id"]
+                
                 for t in my_theses:
                     with st.container(border=True):
                         st.markdown(f"**🔭 {t['thesis_statement']}**")
@@ -607,20 +734,119 @@ def render_dashboard(api_key, ticker_symbol):
                         st.caption(f"📅 {t['time_horizon']} | 💪 Conf: {t['confidence']}/10 | Created: {t.get('created_at', 'N/A')}")
                         
                         c1, c2 = st.columns([1, 5])
-                        if c1.button("🗑️", key=f"del_{t['id']}"):
-                            theses_manager.delete_thesis(t['id'])
-                            st.rerun()
-                            
-                        if c2.button("Edit", key=f"edit_{t['id']}"):
-                            st.session_state["draft_fn_statement"] = t["thesis_statement"]
-                            st.session_state["draft_fn_condition"] = t["falsification_condition"]
-                            st.session_state["draft_fn_horizon"] = t["time_horizon"]
-                            st.session_state["draft_fn_confidence"] = int(t["confidence"])
-                            st.session_state["draft_thesis_id"] = t["id"]
-                            st.rerun()
+                        c1.button("🗑️", key=f"del_{t['id']}", on_click=on_delete_thesis, args=(t['id'],))
+                        c2.button("Edit", key=f"edit_{t['id']}", on_click=on_edit_thesis, args=(t,))
     else:
         st.info("Enter a stock ticker and click 'Get Data' to start.")
 
+@lru_cache(maxsize=512)
+def compute_verification_label(created_str, time_horizon, verification_date, today_ord):
+    """
+    Derives (created_display, verif_label, verif_color) for a journal card.
+    Uses the verification_date stored at save time; older records fall back to deriving it.
+    """
+    if not created_str:
+        return "N/A", "N/A", "gray"
+    
+    try:
+        verif_ord = date.fromisoformat(verification_date).toordinal()
+    except (TypeError, ValueError):
+        # Older records (or a malformed stored value): derive it like the legacy path
+        verification_date = theses_manager.compute_verification_date(created_str, time_horizon)
+        if verification_date is None:
+            return created_str, "Unknown", "gray"
+        verif_ord = date.fromisoformat(verification_date).toordinal()
+    
+    created_display = created_str[:10]
+    
+    # Colors for urgency: bucket 0 = expired, 1 = due within 30 days, 2 = later
+    days_left = verif_ord - today_ord
+    bucket = bisect.bisect_right(URGENCY_THRESHOLDS, days_left)
+    verif_label = URGENCY_LABEL_FORMATS[bucket].format(date=verification_date, days=days_left)
+    return created_display, verif_label, URGENCY_COLORS[bucket]
+
+@lru_cache(maxsize=1024)
+def format_card_title(ticker, created_display, verif_label):
+    """Expander label for a journal card (memoized across reruns)."""
+    return f"{ticker} | 📅 Created: {created_display} | 🎯 Check By: {verif_label}"
+
+@lru_cache(maxsize=1024)
+def format_card_caption(created_display, verif_color, verif_label, time_horizon, confidence):
+    """Metadata line for a journal card (memoized across reruns)."""
+    return f"📅 Created: {created_display} | 🎯 Check By: :{verif_color}[{verif_label}] | ⏳ Horizon: {time_horizon} | 💪 Conf: {confidence}/10"
+
+def set_edit_mode(thesis_id, editing):
+    """Button callback: toggles a journal card's edit mode before the (fragment) rerun."""
+    editing_ids = st.session_state.setdefault("editing_ids", set())
+    if editing:
+        editing_ids.add(thesis_id)
+    else:
+        editing_ids.discard(thesis_id)
+
+@st.fragment
+def render_thesis_card(t, created_display, verif_label, verif_color):
+    """
+    Renders one journal card. Runs as a fragment so Edit/Cancel only rerun this card,
+    not the whole journal loop and sidebar. Save/Delete still force a full rerun since
+    the card header and the theses list change.
+    """
+    # Check Edit Mode
+    is_editing = t['id'] in st.session_state["editing_ids"]
+    
+    with st.expander(format_card_title(t['ticker'], created_display, verif_label), expanded=True):
+        if is_editing:
+            # Edit Mode Inputs
+            new_statement = st.text_area("Thesis", t['thesis_statement'], key=f"e_s_{t['id']}")
+            new_condition = st.text_area("Kill Switch", t['falsification_condition'], key=f"e_c_{t['id']}")
+            
+            c_e1, c_e2 = st.columns(2)
+            # Horizon index safety
+            h_opts = ["1-3 Months", "3-6 Months", "6-12 Months", "1+ Year"]
+            curr_h_idx = h_opts.index(t['time_horizon']) if t['time_horizon'] in h_opts else 1
+            
+            new_horizon = c_e1.selectbox("Horizon", h_opts, index=curr_h_idx, key=f"e_h_{t['id']}")
+            new_conf = c_e2.slider("Confidence", 1, 10, int(t['confidence']), key=f"e_cf_{t['id']}")
+            
+            # Save / Cancel
+            ca, cb = st.columns([1, 1])
+            if ca.button("💾 Save", key=f"save_{t['id']}"):
+                updated_thesis = t.copy()
+                updated_thesis.update({
+                    "thesis_statement": new_statement,
+                    "falsification_condition": new_condition,
+                    "time_horizon": new_horizon,
+                    "confidence": new_conf
+                })
+                theses_manager.save_thesis(updated_thesis)
+                st.session_state["editing_ids"].discard(t['id'])
+                # Full rerun: header labels and the cached theses list need refreshing
+                st.rerun()
+                
+            cb.button("❌ Cancel", key=f"cancel_{t['id']}", on_click=set_edit_mode, args=(t['id'], False))
+        else:
+            # View Mode - Visual Enhancement
+            
+            # Static card content as a single Markdown element (one websocket message instead of ~8)
+            # 1. Ticker as Title, 2. Metadata line, 3. Sections as Subheaders & Content as Normal Text
+            st.markdown(
+                f"# {t['ticker']}\n\n"
+                f"{format_card_caption(created_display, verif_color, verif_label, t['time_horizon'], t['confidence'])}\n\n"
+                f"---\n\n"
+                f"### 🔭 Thesis\n\n{t['thesis_statement']}\n\n"
+                f"### ☠️ Falsification Condition (Kill Switch)\n\n{t['falsification_condition']}\n\n"
+                f"---"
+            )
+            
+            # Actions
+            ca, cb = st.columns([1, 4])
+            if ca.button("Delete", key=f"j_del_{t['id']}"):
+                theses_manager.delete_thesis(t['id'])
+                st.session_state["editing_ids"].discard(t['id'])
+                # Full rerun: the card must disappear from the list
+                st.rerun()
+                
+            cb.button("Edit", key=f"j_edit_{t['id']}", on_click=set_edit_mode, args=(t['id'], True))
+
 def render_journal(api_key):
     """
     Renders the Global Investment Journal with inline editing.
@@ -628,7 +854,7 @@ def render_journal(api_key):
     st.header("📖 Global Investment Journal")
 
     # Load all data
-    all_theses = theses_manager.load_theses() or []
+    all_theses = get_all_theses()
     
     if not all_theses:
         st.info("No investment theses found. Go to 'Stock Dashboard' to create one!")
@@ -641,127 +867,33 @@ def render_journal(api_key):
     
     st.divider()
     
+    today_ord = date.today().toordinal()
+    # Ids of cards currently in edit mode
+    st.session_state.setdefault("editing_ids", set())
+    
     # Display as Cards (Iterate)
     for t in all_theses:
         status_icon = "✅" if t.get('status')=='Active' else "🏁"
         
-        # Calculate Date Logic
-        created_str = t.get('created_at', '')
-        verification_date_str = "N/A"
-        
-        if created_str:
-            try:
-                # Assuming format %Y-%m-%d %H:%M:%S
-                created_dt = datetime.strptime(created_str, "%Y-%m-%d %H:%M:%S")
-                created_display = created_dt.strftime("%Y-%m-%d")
-                
-                # Estimate verification date from horizon
-                horizon_map = {
-                    "1-3 Months": 90,
-                    "3-6 Months": 180,
-                    "6-12 Months": 365,
-                    "1+ Year": 365 # Default to 1Y
-                }
-                days = horizon_map.get(t['time_horizon'], 180)
-                verif_dt = created_dt + timedelta(days=days)
-                verification_date_str = verif_dt.strftime("%Y-%m-%d")
-                
-                # Colors for urgency
-                days_left = (verif_dt - datetime.now()).days
-                if days_left < 0:
-                    verif_color = "red"
-                    verif_label = f"{verification_date_str} (Expired)"
-                elif days_left < 30:
-                    verif_color = "orange"
-                    verif_label = f"{verification_date_str} ({days_left} days left)"
-                else:
-                    verif_color = "green"
-                    verif_label = f"{verification_date_str}"
-                    
-            except:
-                created_display = created_str
-                verif_label = "Unknown"
-                verif_color = "gray"
-        else:
-            created_display = "N/A"
-            verif_label = "N/A"
-            verif_color = "gray"
+        # Calculate Date Logic (memoized per created_at/horizon/day)
+        created_display, verif_label, verif_color = compute_verification_label(t.get('created_at', ''), t.get('time_horizon'), t.get('verification_date'), today_ord)
 
-        # Check Edit Mode
-        is_editing = st.session_state.get(f"edit_mode_{t['id']}", False)
-        
-        with st.expander(f"{t['ticker']} | 📅 Created: {created_display} | 🎯 Check By: {verif_label}", expanded=True):
-            if is_editing:
-                # Edit Mode Inputs
-                new_statement = st.text_area("Thesis", t['thesis_statement'], key=f"e_s_{t['id']}")
-                new_condition = st.text_area("Kill Switch", t['falsification_condition'], key=f"e_c_{t['id']}")
-                
-                c_e1, c_e2 = st.columns(2)
-                # Horizon index safety
-                h_opts = ["1-3 Months", "3-6 Months", "6-12 Months", "1+ Year"]
-                curr_h_idx = h_opts.index(t['time_horizon']) if t['time_horizon'] in h_opts else 1
-                
-                new_horizon = c_e1.selectbox("Horizon", h_opts, index=curr_h_idx, key=f"e_h_{t['id']}")
-                new_conf = c_e2.slider("Confidence", 1, 10, int(t['confidence']), key=f"e_cf_{t['id']}")
-                
-                # Save / Cancel
-                ca, cb = st.columns([1, 1])
-                if ca.button("💾 Save", key=f"save_{t['id']}"):
-                    updated_thesis = t.copy()
-                    updated_thesis.update({
-                        "thesis_statement": new_statement,
-                        "falsification_condition": new_condition,
-                        "time_horizon": new_horizon,
-                        "confidence": new_conf
-                    })
-                    theses_manager.save_thesis(updated_thesis)
-                    st.session_state[f"edit_mode_{t['id']}"] = False
-                    st.rerun()
-                    
-                if cb.button("❌ Cancel", key=f"cancel_{t['id']}"):
-                    st.session_state[f"edit_mode_{t['id']}"] = False
-                    st.rerun()
-            else:
-                # View Mode - Visual Enhancement
-                
-                # 1. Ticker as Title
-                st.title(f"{t['ticker']}")
-                
-                # 2. Metadata line
-                st.caption(f"📅 Created: {created_display} | 🎯 Check By: :{verif_color}[{verif_label}] | ⏳ Horizon: {t['time_horizon']} | 💪 Conf: {t['confidence']}/10")
-                
-                st.divider()
-                
-                # 3. Sections as Subheaders & Content as Normal Text
-                st.subheader("🔭 Thesis")
-                st.write(t['thesis_statement'])
-                
-                st.subheader("☠️ Falsification Condition (Kill Switch)")
-                st.write(t['falsification_condition'])
-                
-                st.divider()
-                
-                # Actions
-                ca, cb = st.columns([1, 4])
-                if ca.button("Delete", key=f"j_del_{t['id']}"):
-                    theses_manager.delete_thesis(t['id'])
-                    st.rerun()
-                    
-                if cb.button("Edit", key=f"j_edit_{t['id']}"):
-                    st.session_state[f"edit_mode_{t['id']}"] = True
-                    st.rerun()
+        render_thesis_card(t, created_display, verif_label, verif_color)
 
 def main():
     st.title("📈 Investment Dashboard Pro")
     
+    # Seed the API key widget from the environment once per session
+    if "global_api_key" not in st.session_state:
+        st.session_state["global_api_key"] = os.getenv("GEMINI_API_KEY", "")
+    
     with st.sidebar:
         st.header("Navigation")
         page = st.radio("Go to", ["Stock Dashboard", "Investment Journal"])
         st.divider()
     
         st.header("Global Settings")
-        env_key = os.getenv("GEMINI_API_KEY", "")
-        api_key = st.text_input("Gemini API Key", value=env_key, type="password", key="global_api_key")
+        api_key = st.text_input("Gemini API Key", type="password", key="global_api_key")
         st.info("💡 Providing an API Key enables AI news & strategy analysis.")
     
     if page == "Stock Dashboard":
@@ -3,81 +3,160 @@ Earnings Calendar Cache Manager
 
 Caches FMP earnings calendar results to minimize API calls.
 Each ticker is only queried once per day.
+
+Storage is a single SQLite database (one row per ticker, WAL mode), so a
+watchlist of N tickers is read with one query instead of N file opens.
+Each row carries an `expires` timestamp (the next local midnight), so stale
+rows are filtered in SQL without parsing their payload.
+
+Tickers are normalized once per public call via _norm(); internal helpers
+expect the canonical (upper-case, interned) form.
 """
 
-import json
 import os
-from typing import Dict, Optional
-from datetime import datetime, date
+import sqlite3
+import sys
+from typing import Dict, Iterable, Optional
+from datetime import datetime, date, time, timedelta
+
+from storage_utils import SharedConnection, loads as _loads, dumps as _dumps
+
+DB_PATH = "earnings_cache.db"
+# Per-ticker JSON files written by earlier versions; imported once when the DB is created
+LEGACY_CACHE_DIR = "earnings_cache"
+
+
+def _norm(ticker: str) -> str:
+    """Canonical cache key: upper-cased and interned so dict lookups can short-circuit on identity."""
+    return sys.intern(ticker.upper())
+
+
+def _expiry(cached_date: date) -> float:
+    """Timestamp of the local midnight after cached_date (entries are valid for that day only)."""
+    return datetime.combine(cached_date + timedelta(days=1), time.min).timestamp()
+
+
+def _import_legacy_files(conn: sqlite3.Connection) -> None:
+    """Copies entries from the old per-ticker JSON files into a freshly created DB."""
+    if not os.path.isdir(LEGACY_CACHE_DIR):
+        return
 
-CACHE_FILE = "earnings_cache.json"
+    rows = []
+    for name in os.listdir(LEGACY_CACHE_DIR):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(LEGACY_CACHE_DIR, name), "rb") as f:
+                entry = _loads(f.read())
+            expires = _expiry(date.fromisoformat(entry["cached_date"]))
+        except Exception as e:
+            print(f"Warning: skipping legacy earnings cache file {name}: {e}")
+            continue
+        rows.append((_norm(name[:-len(".json")]), _dumps(entry), expires))
+
+    if rows:
+        conn.executemany("INSERT OR REPLACE INTO earnings_cache VALUES (?, ?, ?)", rows)
+
+
+_DB = SharedConnection(
+    DB_PATH,
+    "CREATE TABLE IF NOT EXISTS earnings_cache (symbol TEXT PRIMARY KEY, payload BLOB, expires REAL)",
+    seed=_import_legacy_files,
+)
 
 
 def load_cache() -> Dict:
-    """Loads the entire earnings cache from JSON file."""
-    if not os.path.exists(CACHE_FILE):
-        return {}
+    """Loads the entire earnings cache (all tickers)."""
     try:
-        with open(CACHE_FILE, "r") as f:
-            content = f.read()
-            if not content:
-                return {}
-            return json.loads(content)
-    except json.JSONDecodeError:
-        print(f"Warning: JSONDecodeError in {CACHE_FILE}, returning empty cache")
-        return {}
+        with _DB.lock:
+            rows = _DB.get().execute("SELECT symbol, payload FROM earnings_cache").fetchall()
     except Exception as e:
         print(f"Error loading earnings cache: {e}")
         return {}
+    return {_norm(symbol): _loads(payload) for symbol, payload in rows}
 
 
 def get_cached_earnings(ticker: str) -> Optional[Dict]:
     """
     Retrieves cached earnings data for a ticker if it was cached today.
-    
+
     Returns:
         Dict with earnings info if cached today, None if stale or not found
     """
-    cache = load_cache()
-    entry = cache.get(ticker.upper())
-    
-    if not entry:
+    try:
+        with _DB.lock:
+            row = _DB.get().execute(
+                "SELECT payload, expires FROM earnings_cache WHERE symbol = ?", (_norm(ticker),)
+            ).fetchone()
+    except Exception as e:
+        print(f"Error loading earnings cache: {e}")
         return None
-    
-    # Check if cached today
-    cached_date = entry.get("cached_date")
-    today = date.today().isoformat()
-    
-    if cached_date != today:
-        print(f"[EarningsCache] Stale cache for {ticker} (cached: {cached_date}, today: {today})")
+
+    if row is None:
         return None
-    
+
+    payload, expires = row
+    if expires <= datetime.now().timestamp():
+        # Expired rows are rejected before their payload is parsed
+        print(f"[EarningsCache] Stale cache for {ticker}")
+        return None
+
     print(f"[EarningsCache] Cache hit for {ticker}")
-    return entry.get("data")
+    return _loads(payload).get("data")
+
+
+def get_cached_earnings_many(tickers: Iterable[str]) -> Dict[str, Optional[Dict]]:
+    """
+    Batch version of get_cached_earnings (one query for all tickers).
+
+    Returns:
+        Dict mapping each upper-cased ticker to its earnings info if cached today, else None
+    """
+    results = {_norm(ticker): None for ticker in tickers}
+    if not results:
+        return results
+
+    keys = list(results)
+    try:
+        with _DB.lock:
+            rows = _DB.get().execute(
+                f"SELECT symbol, payload FROM earnings_cache "
+                f"WHERE expires > ? AND symbol IN ({','.join('?' * len(keys))})",
+                (datetime.now().timestamp(), *keys),
+            ).fetchall()
+    except Exception as e:
+        print(f"Error loading earnings cache: {e}")
+        return results
+
+    for symbol, payload in rows:
+        results[_norm(symbol)] = _loads(payload).get("data")
+    return results
 
 
 def save_earnings(ticker: str, data: Dict) -> bool:
     """
     Saves earnings data to cache with today's date.
-    
+
     Args:
         ticker: Stock ticker symbol
         data: Dict with earnings info (next_earnings, dividend_date, etc.)
-    
+
     Returns:
         True if saved successfully, False otherwise
     """
-    cache = load_cache()
-    
-    cache[ticker.upper()] = {
+    today = date.today()
+    entry = {
         "data": data,
-        "cached_date": date.today().isoformat(),
+        "cached_date": today.isoformat(),
         "cached_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
     }
-    
+
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache, f, indent=2)
+        with _DB.lock:
+            _DB.get().execute(
+                "INSERT OR REPLACE INTO earnings_cache VALUES (?, ?, ?)",
+                (_norm(ticker), _dumps(entry), _expiry(today)),
+            )
         print(f"[EarningsCache] Cached earnings for {ticker}")
         return True
     except Exception as e:
@@ -89,18 +168,10 @@ def invalidate_cache(ticker: str) -> bool:
     """
     Removes cached earnings for a ticker (for manual refresh).
     """
-    cache = load_cache()
-    ticker_upper = ticker.upper()
-    
-    if ticker_upper not in cache:
-        return False
-    
-    del cache[ticker_upper]
-    
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache, f, indent=2)
-        return True
+        with _DB.lock:
+            cur = _DB.get().execute("DELETE FROM earnings_cache WHERE symbol = ?", (_norm(ticker),))
     except Exception as e:
         print(f"Error invalidating earnings cache: {e}")
         return False
+    return cur.rowcount > 0
@@ -4,72 +4,282 @@ Encapsulates OpenBB calls and provides fallbacks to yfinance/DDG.
 """
 import yfinance as yf
 import pandas as pd
-from openbb import obb
+import numpy as np
 from duckduckgo_search import DDGS
-import traceback
+import os
+import logging
+import requests
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+import functools
+import time
+from datetime import datetime, timedelta
+import threading
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from cachetools import TTLCache
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+import earnings_cache_manager
 
-def get_stock_data(ticker_symbol):
+logger = logging.getLogger(__name__)
+
+class _LazyObb:
     """
-    Fetches basic stock info suitable for UI display.
-    Primary: OpenBB (yfinance provider)
-    Fallback: yfinance direct
+    Stand-in for `openbb.obb` that imports OpenBB on first attribute access.
+    OpenBB registers all its extensions at import (seconds of startup); paths that
+    never reach it (yfinance-only history, cached lookups, scripts) skip that cost.
     """
-    data = {}
-    
-    # 1. Try OpenBB
+    _real = None
+
+    def __getattr__(self, name):
+        if _LazyObb._real is None:
+            from openbb import obb as real
+            _LazyObb._real = real
+        return getattr(_LazyObb._real, name)
+
+obb = _LazyObb()
+
+# Provider config is read once at import. app.py imports this module before its
+# own load_dotenv() call, so load .env here first (it never overrides real env vars).
+load_dotenv()
+_TIINGO = bool(os.environ.get("OPENBB_TIINGO_TOKEN"))
+_FMP_KEY = os.environ.get("FMP_API_KEY")
+# OpenBB providers in priority order (Tiingo first when a token is configured)
+_PROVIDERS = ("tiingo", "yfinance") if _TIINGO else ("yfinance",)
+
+# Circuit breaker per (endpoint, provider): after _BREAKER_FAILS consecutive exceptions
+# the provider is skipped for _BREAKER_COOLDOWN seconds instead of eating its timeout each call.
+_BREAKER_FAILS = 3
+_BREAKER_COOLDOWN = 60
+_BREAKER = {}  # (endpoint, provider) -> (consecutive_fails, cooldown_until_ts)
+_breaker_lock = threading.Lock()
+
+def _provider_available(key):
+    """False while the provider's breaker is open."""
+    return _BREAKER.get(key, (0, 0.0))[1] <= time.time()
+
+def _record_provider(key, ok):
+    """Resets the breaker on success; counts the failure (and opens the breaker) otherwise."""
+    with _breaker_lock:
+        if ok:
+            _BREAKER.pop(key, None)
+            return
+        fails = _BREAKER.get(key, (0, 0.0))[0] + 1
+        until = time.time() + _BREAKER_COOLDOWN if fails >= _BREAKER_FAILS else 0.0
+        _BREAKER[key] = (fails, until)
+        if until:
+            logger.warning("[OpenBB] %s provider %s failed %d times, skipping for %ds", key[0], key[1], fails, _BREAKER_COOLDOWN)
+
+# One keep-alive pool for every plain-HTTP API call in the app (FMP here, Polymarket in utils).
+# yfinance and DDGS manage their own clients (curl_cffi / primp) and can't take a requests.Session.
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers.update({"User-Agent": "stock-dashboard"})
+HTTP_SESSION.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
+
+# In-flight upstream calls: (function name, args, kwargs) -> Future
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def coalesce(fn):
+    """
+    Collapses concurrent identical calls into one upstream request.
+    The first caller runs fn; callers arriving while it is in flight wait on the same
+    Future and get a copy of its result (callers such as calculate_momentum mutate frames).
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        with _inflight_lock:
+            fut = _inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                _inflight[key] = fut
+        
+        if not owner:
+            result = fut.result()
+            return result.copy() if hasattr(result, "copy") else result
+        
+        try:
+            result = fn(*args, **kwargs)
+            fut.set_result(result)
+            return result
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+    return wrapper
+
+# Process-local result caches, TTL chosen per data type
+_quote_cache = TTLCache(maxsize=1024, ttl=60)      # ticker + live quote fields in .info
+_profile_cache = TTLCache(maxsize=1024, ttl=3600)  # valuation history (PE bands)
+_hist_cache = TTLCache(maxsize=1024, ttl=300)      # price history
+_news_cache = TTLCache(maxsize=1024, ttl=60)       # headlines
+_cache_lock = threading.RLock()
+
+# Reused yf.Ticker objects: yfinance memoizes info/calendar/earnings on the instance.
+# The TTL is coupled to _quote_cache: get_stock_data serves quotes from ticker.info,
+# so a Ticker must not outlive a quote entry or expired quotes come back unrefreshed.
+_ticker_cache = TTLCache(maxsize=256, ttl=_quote_cache.ttl)
+
+# Optional on-disk layer behind the TTL caches so fetched frames survive restarts
+# (Streamlit reruns after code edits, debug scripts). Same TTLs as in memory.
+OBB_DISK_CACHE_DIR = ".obb_cache"
+_DISK_CACHE_LIMIT = 256 * 1024 * 1024
+_disk = None
+
+def _disk_cache():
+    """Returns the shared diskcache.Cache, opening it on first use; None without diskcache."""
+    global _disk
+    if diskcache is None:
+        return None
+    with _cache_lock:
+        if _disk is None:
+            try:
+                _disk = diskcache.Cache(OBB_DISK_CACHE_DIR, size_limit=_DISK_CACHE_LIMIT)
+            except Exception as e:
+                logger.warning("Disk cache unavailable: %s", e)
+                return None
+    return _disk
+
+def get_ticker(ticker_symbol):
+    """Returns a shared yf.Ticker for the symbol, creating it on first use."""
+    key = ticker_symbol.upper()
+    with _cache_lock:
+        ticker = _ticker_cache.get(key)
+        if ticker is None:
+            ticker = _ticker_cache[key] = yf.Ticker(ticker_symbol)
+    return ticker
+
+def invalidate(ticker_symbol):
+    """
+    Drops every cached result (and the shared yf.Ticker) for a symbol, e.g. for a manual refresh.
+    Returns the number of entries removed.
+    """
+    key = ticker_symbol.upper()
+    removed = 0
+    with _cache_lock:
+        for cache in (_quote_cache, _profile_cache, _hist_cache, _news_cache):
+            stale = [k for k in cache if k[1] and str(k[1][0]).upper() == key]
+            for k in stale:
+                cache.pop(k, None)
+            removed += len(stale)
+        if _ticker_cache.pop(key, None) is not None:
+            removed += 1
+    dc = _disk_cache()
+    if dc is not None:
+        try:
+            for k in list(dc.iterkeys()):
+                if k[1] and str(k[1][0]).upper() == key and dc.delete(k):
+                    removed += 1
+        except Exception as e:
+            logger.warning("Disk cache invalidate failed: %s", e)
+    return removed
+
+# DDGS clients keep their own HTTP connection. Callers mostly run on short-lived
+# threads (per-call executors, Streamlit reruns), so idle clients live in a
+# module-level pool and are checked out for one search at a time: a DDGS instance
+# carries per-request state and is never used by two threads at once.
+_ddgs_pool = queue.SimpleQueue()
+
+def _ddgs_search(method, **kwargs):
+    """Runs one DDGS search (`method` is "news" or "text") on a pooled client and returns a list."""
     try:
-        # obb.equity.profile returns an OBBject
-        res = obb.equity.profile(symbol=ticker_symbol, provider="yfinance")
-        # .results is usually a list of Pydantic models
-        if res.results and isinstance(res.results, list):
-            profile = res.results[0]
-            
-            # Map OpenBB model to our dict format
-            # Using getattr to be safe, though Pydantic models should have attributes
-            data['shortName'] = getattr(profile, 'name', ticker_symbol)
-            data['sector'] = getattr(profile, 'sector', 'N/A')
-            data['industry'] = getattr(profile, 'industry_category', 'N/A')
-            data['marketCap'] = getattr(profile, 'market_cap', 0)
-            data['employees'] = getattr(profile, 'employees', 0)
-            data['longBusinessSummary'] = getattr(profile, 'long_description', "")
-            data['website'] = getattr(profile, 'company_url', "")
-            
-            # Additional fetch for price metrics (OpenBB profile doesn't always have current price/PE)
-            # We can use yf.Ticker for real-time price as OpenBB price.historical is historical
-            # Or use obb.equity.price.quote if available (provider dependent)
-            # For now, let's mixin yfinance for price to be safe and fast for real-time
-            ticker = yf.Ticker(ticker_symbol)
-            info = ticker.info # Only minor fetch
-            data['currentPrice'] = info.get('currentPrice', 0)
-            data['trailingPE'] = info.get('trailingPE', 0)
-            data['fiftyTwoWeekHigh'] = info.get('fiftyTwoWeekHigh', 0)
-            data['fiftyTwoWeekLow'] = info.get('fiftyTwoWeekLow', 0)
-            
-            # Return tuple compatible with app.py expectation: (ticker_obj, error_msg)
-            # app.py expects a yfinance Ticker object to pass to other functions?
-            # actually app.py usage:
-            # ticker, error = utils.get_stock_data(symbol)
-            # info = ticker.info
-            # So we need to return something that mimics Ticker or refactor app.py to take a dict.
-            # Refactoring app.py is safer to avoid hidden yf dependencies.
-            # BUT to keep changes minimal in utils.py replacement, we can return a Mock object or the yf ticker with patched info.
-            
-            # STRATEGY: Return the yf.Ticker object, but patch its .info with OpenBB data where better?
-            # Or just return the yf.Ticker object if we successfully validated presence with OpenBB.
-            # Original code returns: ticker, error. And checks ticker.history().
-            
-            # Let's keep it simple: Validate existence with OpenBB, but return yf.Ticker for compatibility 
-            # with existing downstream functions (like get_financials which takes ticker object).
-            # This is a "Soft Migration" - using OpenBB to validate symbol and get profile, but keeping yf object for compat.
+        ddgs = _ddgs_pool.get_nowait()
+    except queue.Empty:
+        ddgs = DDGS()
+    results = list(getattr(ddgs, method)(**kwargs) or [])
+    # Only clients that completed a search go back; a failed one is dropped
+    _ddgs_pool.put(ddgs)
+    return results
+
+def ddgs_news(**kwargs):
+    """DDGS().news(...) on a pooled client."""
+    return _ddgs_search("news", **kwargs)
+
+def ddgs_text(**kwargs):
+    """DDGS().text(...) on a pooled client."""
+    return _ddgs_search("text", **kwargs)
+
+def ttl_cached(cache, persist=False):
+    """
+    Memoizes a symbol lookup in the given TTLCache, keyed on function name and arguments.
+    Empty results are not cached so transient upstream failures are retried.
+    Hits return a copy because some callers mutate the returned frame.
+    With persist=True results are also written to the disk cache (same TTL), which
+    backs memory misses; only use it for picklable results.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            with _cache_lock:
+                hit = cache.get(key)
+            dc = _disk_cache() if persist else None
+            if hit is None and dc is not None:
+                try:
+                    hit = dc.get(key)
+                except Exception as e:
+                    logger.debug("Disk cache read failed: %s", e)
+                if hit is not None:
+                    with _cache_lock:
+                        cache[key] = hit
+            if hit is not None:
+                return hit.copy() if hasattr(hit, "copy") else hit
             
+            result = fn(*args, **kwargs)
+            if isinstance(result, pd.DataFrame):
+                empty = result.empty
+            elif isinstance(result, tuple):
+                # (value, error) pairs, e.g. get_stock_data
+                empty = result[0] is None
+            else:
+                empty = not result
+            if not empty:
+                with _cache_lock:
+                    cache[key] = result
+                if dc is not None:
+                    try:
+                        dc.set(key, result, expire=cache.ttl)
+                    except Exception as e:
+                        logger.debug("Disk cache write failed: %s", e)
+                return result.copy() if hasattr(result, "copy") else result
+            return result
+        return wrapper
+    return decorator
+
+@ttl_cached(_quote_cache)
+@coalesce
+def get_stock_data(ticker_symbol):
+    """
+    Fetches the yfinance Ticker used for UI display.
+    Returns (ticker_obj, error_msg); app.py and get_financials consume the Ticker directly.
+    
+    The OpenBB profile call used to run first only as an existence check and its
+    fields were discarded, so the hot path is now a single info fetch. The info
+    dict stays cached on the Ticker object for downstream reads.
+    """
+    # 1. Validate via info (one request, reused by callers through ticker.info)
+    try:
+        ticker = get_ticker(ticker_symbol)
+        info = ticker.info
+        if info and (info.get('quoteType') or info.get('shortName')):
             return ticker, None
-            
     except Exception as e:
-        print(f"[OpenBB] get_stock_data failed: {e}")
+        logger.warning("[yfinance] get_stock_data info failed: %s", e)
 
     # 2. Fallback / Original Logic
     try:
-        ticker = yf.Ticker(ticker_symbol)
+        ticker = get_ticker(ticker_symbol)
         # Force a data fetch to check if valid
         hist = ticker.history(period="1d")
         if hist.empty:
@@ -78,6 +288,25 @@ def get_stock_data(ticker_symbol):
     except Exception as e:
         return None, str(e)
 
+# Yfinance provider often puts content in 'summary' or 'text'
+_NEWS_BODY_KEYS = ('body', 'text', 'summary')
+
+def _field_getter(obj):
+    """
+    Returns get(key, default) for a news item or OpenBB result model.
+    Models are flattened once into a plain dict (declared fields + provider extras),
+    so each field read is a dict lookup rather than pydantic attribute resolution.
+    """
+    if isinstance(obj, dict):
+        return obj.get
+    fields = getattr(obj, '__dict__', None)
+    if fields is None:
+        return functools.partial(getattr, obj)
+    extra = getattr(obj, '__pydantic_extra__', None)
+    return {**fields, **extra}.get if extra else fields.get
+
+@ttl_cached(_news_cache, persist=True)
+@coalesce
 def get_news(ticker_symbol, limit=10):
     """
     Fetches news items.
@@ -91,60 +320,64 @@ def get_news(ticker_symbol, limit=10):
     try:
         # obb.news.company returns list of OBBject items
         # Logic to prioritize Tiingo
-        import os
-        providers = ["yfinance"]
-        if os.environ.get("OPENBB_TIINGO_TOKEN"):
-            providers.insert(0, "tiingo")
 
         res = None
-        for p in providers:
+        for p in _PROVIDERS:
+            if not _provider_available(("news", p)):
+                continue
             try:
-                # print(f"[OpenBB] Try news provider: {p}")
+                logger.debug("[OpenBB] Try news provider: %s", p)
                 curr = obb.news.company(symbol=ticker_symbol, limit=limit, provider=p)
+                _record_provider(("news", p), True)
                 if curr and curr.results:
                     res = curr
                     break
             except Exception as e:
-                 print(f"[OpenBB] Provider {p} error: {e}")
+                 _record_provider(("news", p), False)
+                 logger.debug("[OpenBB] Provider %s error: %s", p, e)
 
         if res and res.results:
             for item in res.results:
-                # Helper to safely get attribute or dict key
-                def get_val(obj, key, default=''):
-                    if isinstance(obj, dict):
-                        return obj.get(key, default)
-                    return getattr(obj, key, default)
-
                 # Standardize to list of dicts: {'title', 'source', 'date', 'body', 'url'}
-                # Yfinance provider often puts content in 'summary' or 'text'
-                body = get_val(item, 'body') or get_val(item, 'text') or get_val(item, 'summary') or ''
+                get = _field_getter(item)
+                body = next((v for v in (get(k, '') for k in _NEWS_BODY_KEYS) if v), '')
                 
                 news_items.append({
-                    'title': get_val(item, 'title', ''),
-                    'source': get_val(item, 'source', 'OpenBB'),
-                    'date': str(get_val(item, 'date', '')), # Convert datetime to str
+                    'title': get('title', ''),
+                    'source': get('source', 'OpenBB'),
+                    'date': str(get('date', '')), # Convert datetime to str
                     'body': body, 
-                    'url': get_val(item, 'url', '')
+                    'url': get('url', '')
                 })
             # If we got good results, return them. 
             # Note: OpenBB yfinance provider sometimes gives empty 'text' body.
             if len(news_items) > 0:
                  return news_items
     except Exception as e:
-        print(f"[OpenBB] get_news failed: {e}")
+        logger.warning("[OpenBB] get_news failed: %s", e)
 
     # 2. Fallback: DuckDuckGo
-    print("[Fallback] Using DuckDuckGo for news...")
+    logger.info("[Fallback] Using DuckDuckGo for news...")
+    # Both query variants (Past Year) run concurrently; the specific "stock" query wins if non-empty
+    def run_query(keywords):
+        try:
+            return ddgs_news(keywords=keywords, region="us-en", safesearch="off", timelimit="y", max_results=limit)
+        except Exception as e:
+            logger.warning("[DDG] get_news failed for '%s': %s", keywords, e)
+            return []
+    
+    executor = ThreadPoolExecutor(max_workers=2)
+    f_stock = executor.submit(run_query, f"{ticker_symbol} stock")
+    f_news = executor.submit(run_query, f"{ticker_symbol} news")
     try:
-        # Try specific query first (Past Year)
-        ddgs = DDGS()
-        results = ddgs.news(keywords=f"{ticker_symbol} stock", region="us-en", safesearch="off", timelimit="y", max_results=limit)
-        if not results:
-            results = ddgs.news(keywords=f"{ticker_symbol} news", region="us-en", safesearch="off", timelimit="y", max_results=limit)
-        return results if results else []
-    except Exception as e:
-        print(f"[DDG] get_news failed: {e}")
-        return []
+        results = f_stock.result()
+        if results:
+            # Don't wait on the backup query once the primary one answered
+            f_news.cancel()
+            return results
+        return f_news.result() or []
+    finally:
+        executor.shutdown(wait=False)
 
 def get_financials(ticker_obj):
     """
@@ -162,15 +395,47 @@ def get_financials(ticker_obj):
         financials['cashflow'] = ticker_obj.quarterly_cashflow
         financials['info'] = ticker_obj.info
     except Exception as e:
-         print(f"Error fetching financials: {e}")
+         logger.warning("Error fetching financials: %s", e)
     return financials
 
-def get_historical_data(ticker_symbol, period="1y"):
+# OpenBB snake_case price columns -> yfinance names used downstream
+_OHLC_RENAME = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume', 'adj_close': 'Adj Close'}
+
+_PRICE_COLS = ['Open', 'High', 'Low', 'Close']
+
+def _downcast_prices(df, dtype):
+    """
+    Casts OHLC columns to dtype in place (float32 halves the bytes plotted and merged).
+    Volume keeps its integer dtype: daily share volume can exceed the int32 range.
+    """
+    if dtype is not None:
+        cols = [c for c in _PRICE_COLS if c in df.columns]
+        if cols:
+            df[cols] = df[cols].astype(dtype)
+    return df
+
+def _yf_history(ticker_symbol, period, dtype):
+    """Price history straight from yfinance."""
+    try:
+        t = get_ticker(ticker_symbol)
+        return _downcast_prices(t.history(period=period), dtype)
+    except Exception as e:
+        logger.warning("Error fetching historical data: %s", e)
+        return pd.DataFrame()
+
+@ttl_cached(_hist_cache, persist=True)
+@coalesce
+def get_historical_data(ticker_symbol, period="1y", dtype="float32"):
     """
     Fetches historical price data.
-    Primary: OpenBB
+    Primary: OpenBB (only when Tiingo is configured)
     Fallback: yfinance
+    OHLC columns are returned as `dtype` (pass None to keep float64).
     """
+    # Without Tiingo, OpenBB's only provider is yfinance itself: skip the wrapper layers
+    if not _TIINGO:
+        return _yf_history(ticker_symbol, period, dtype)
+    
     # 1. OpenBB
     try:
         # Convert period '1y' to start_date logic or just use limit?
@@ -178,25 +443,25 @@ def get_historical_data(ticker_symbol, period="1y"):
         # Simple mapping:
         # obb.equity.price.historical(symbol=ticker_symbol, provider="yfinance") 
         
-        import os
-        providers = ["yfinance"]
-        if os.environ.get("OPENBB_TIINGO_TOKEN"):
-            providers.insert(0, "tiingo")
             
         res = None
-        for p in providers:
+        for p in _PROVIDERS:
+            if not _provider_available(("historical", p)):
+                continue
             try:
-                # print(f"[OpenBB] Try historical provider: {p}")
+                logger.debug("[OpenBB] Try historical provider: %s", p)
                 # Note: Tiingo requires start_date sometimes or defaults to recent. yfinance defaults to max or period.
                 # obb.equity.price.historical standardizes args usually.
                 # However, for pure 'period' mapping, we might need to calc start_date if using Tiingo strictly.
                 # But let's try calling without strict dates first or basic mapping.
                 curr = obb.equity.price.historical(symbol=ticker_symbol, provider=p) 
+                _record_provider(("historical", p), True)
                 if curr and curr.results:
                     res = curr
                     break
             except Exception as e:
-                print(f"[OpenBB] Historical Provider {p} error: {e}")
+                _record_provider(("historical", p), False)
+                logger.debug("[OpenBB] Historical Provider %s error: %s", p, e)
         
         if not res:
             raise Exception("No results from OpenBB providers")
@@ -206,159 +471,188 @@ def get_historical_data(ticker_symbol, period="1y"):
         # Standardize columns? OpenBB returns: open, high, low, close, volume, ... (lowercase snake_case)
         # yfinance returns: Open, High, Low, Close, Volume (Capitalized)
         # Most of our utils code likely uses Title Case (df['Close']).
-        # Need to rename columns for compatibility.
-        df.columns = [c.title() for c in df.columns]
+        # Need to rename columns for compatibility; other columns pass through verbatim.
+        df.rename(columns=_OHLC_RENAME, inplace=True)
         
         # OpenBB index is usually named 'date', yfinance 'Date'.
         df.index.name = 'Date'
         
-        return df
+        return _downcast_prices(df, dtype)
     except Exception as e:
-        print(f"[OpenBB] get_historical_data failed: {e}")
+        logger.warning("[OpenBB] get_historical_data failed: %s", e)
         
     # 2. Fallback
+    return _yf_history(ticker_symbol, period, dtype)
+
+def prefetch_ticker(ticker_symbol):
+    """
+    Fetches stock data, news and price history for one symbol concurrently.
+    The three calls share no inputs, so wall time is the slowest of them, not the sum.
+    
+    Returns:
+        ((ticker_obj, error_msg), news_items, history_df)
+    """
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        f_stock = executor.submit(get_stock_data, ticker_symbol)
+        f_news = executor.submit(get_news, ticker_symbol)
+        f_hist = executor.submit(get_historical_data, ticker_symbol)
+        return f_stock.result(), f_news.result(), f_hist.result()
+
+# Trading-day lookbacks for the 3M / 6M / 1Y competitor returns
+_CHANGE_OFFSETS = np.array([63, 126, 250])
+# Column order of get_competitor_data rows
+_COMP_COLS = ("Ticker", "Name", "Price", "P/E", "Market Cap", "3M %", "6M %", "1Y %")
+
+def _fetch_competitor_row(t, hist_all=None):
+    """
+    Fetches info for one competitor ticker and builds its metrics row.
+    History comes from the batched download when available, else a per-ticker request.
+    Returns the metrics row as a _COMP_COLS-ordered tuple, or None on failure.
+    """
     try:
-        t = yf.Ticker(ticker_symbol)
-        return t.history(period=period)
-    except Exception as e:
-        print(f"Error fetching historical data: {e}")
-        return pd.DataFrame()
+        stock = get_ticker(t)
+        info = stock.info
+        if hist_all is not None and t in hist_all.columns.get_level_values(0):
+            hist = hist_all[t].dropna(subset=['Close'])
+        else:
+            hist = stock.history(period="1y")
+        
+        # 3M / 6M / 1Y % change from one array read; 0.0 where history is too short
+        closes = hist['Close'].to_numpy(dtype=np.float64)
+        n = len(closes)
+        changes = np.zeros(len(_CHANGE_OFFSETS))
+        if n:
+            valid = _CHANGE_OFFSETS < n
+            start = closes[np.where(valid, n - 1 - _CHANGE_OFFSETS, n - 1)]
+            changes = np.where(valid, (closes[-1] / start - 1) * 100, 0.0)
+
+        # Row tuple in _COMP_COLS order
+        return (
+            t,
+            info.get('shortName', t),
+            info.get('currentPrice', 0),
+            info.get('trailingPE', 0),
+            info.get('marketCap', 0),
+            changes[0],
+            changes[1],
+            changes[2],
+        )
+    except:
+        return None
+
+# Yahoo caps symbols per chart request; larger lists are split into chunks
+_DOWNLOAD_CHUNK = 10
+
+def _download_competitor_history(tickers):
+    """
+    Batched 1y history for all tickers: one yf.download per chunk of _DOWNLOAD_CHUNK symbols,
+    joined column-wise into a (ticker, field) frame. Returns None if nothing usable came back.
+    auto_adjust=True matches Ticker.history() so returns are unchanged.
+    """
+    frames = []
+    for i in range(0, len(tickers), _DOWNLOAD_CHUNK):
+        chunk = tickers[i:i + _DOWNLOAD_CHUNK]
+        try:
+            df = yf.download(chunk, period="1y", group_by='ticker', threads=True, progress=False, auto_adjust=True)
+        except Exception as e:
+            logger.warning("Batch history download failed, falling back to per-ticker: %s", e)
+            continue
+        if not df.empty and isinstance(df.columns, pd.MultiIndex):
+            frames.append(df)
+    
+    if not frames:
+        return None
+    return frames[0] if len(frames) == 1 else pd.concat(frames, axis=1)
 
 def get_competitor_data(tickers):
     """
-    Fetch competitor data.
-    Primary: OpenBB Loop
-    Fallback: yf Loop
+    Fetch competitor data from yfinance (batched history, concurrent per-ticker info).
     """
-    data_list = []
+    if not tickers:
+        return pd.DataFrame()
     
-    # Try efficient OpenBB approach if possible, but OpenBB is usually one symbol at a time for profile
-    # So we loop.
-    for t in tickers:
-        row = {}
-        try:
-            # Profile from OpenBB
-            res = obb.equity.profile(symbol=t, provider="yfinance")
-            if res.results:
-                prof = res.results[0]
-                row["Ticker"] = t
-                row["Name"] = getattr(prof, 'name', t)
-                row["Market Cap"] = getattr(prof, 'market_cap', 0)
-                # For Price/PE we might need quotes or rely on yf fallback inside loop if OpenBB misses
-                
-                # ... This might be too slow to do mixing per ticker.
-                # Let's fallback to pure yfinance for the bulk list if simple.
-                pass
-        except:
-            pass
-            
     # Given the complexity of mixing sources for a list and maintaining speed,
     # and the code structure in utils.py `get_competitor_data` (which calculates returns),
     # it's better to keep utilizing yfinance for bulk history retrieval/calc for now.
-    # We will stick to the utils.py implementation for this one or wrap it simply.
+    # Name and Market Cap come from the same yfinance info as Price/PE, so no OpenBB
+    # profile call is made (its results were never used).
+    hist_all = _download_competitor_history(list(tickers))
     
-    # Re-implementing the exact logic from utils.py but inside here?
-    # Or just importing it? 
-    # Let's write the fallback implementation here.
+    # Per-ticker info fetches are independent network waits; run them concurrently.
+    with ThreadPoolExecutor(max_workers=min(16, len(tickers))) as executor:
+        rows = executor.map(lambda t: _fetch_competitor_row(t, hist_all), tickers)
+    data = [row for row in rows if row is not None]
     
-    data = []
-    for t in tickers:
-        try:
-            stock = yf.Ticker(t)
-            info = stock.info
-            hist = stock.history(period="1y")
-            
-            def get_change(days_ago):
-                if len(hist) > days_ago:
-                    start_price = hist['Close'].iloc[-(days_ago + 1)]
-                    curr_price = hist['Close'].iloc[-1]
-                    return ((curr_price - start_price) / start_price) * 100
-                return 0.0
-
-            data.append({
-                "Ticker": t,
-                "Name": info.get('shortName', t),
-                "Price": info.get('currentPrice', 0),
-                "P/E": info.get('trailingPE', 0),
-                "Market Cap": info.get('marketCap', 0),
-                "3M %": get_change(63),
-                "6M %": get_change(126),
-                "1Y %": get_change(250) if len(hist) > 240 else 0.0
-            })
-        except:
-            continue
-    return pd.DataFrame(data)
+    return pd.DataFrame.from_records(data, columns=_COMP_COLS)
 
-def get_calendar_events(ticker_symbol):
+def _fmp_next_earnings(items, ticker_symbol, today_str):
     """
-    Fetches major calendar events (Earnings, Dividends).
+    Picks the nearest future earnings (epsActual is null) from FMP rows for one symbol.
+    Returns the dates dict (empty if none found).
+    """
+    dates = {}
+    # Earliest future row regardless of FMP's ordering (ISO dates compare as strings)
+    future = [item for item in items if item.get('date', '') >= today_str and item.get('epsActual') is None]
+    if not future:
+        return dates
+    item = min(future, key=lambda item: item['date'])
     
-    Data Sources (in order):
-    1. Daily cache (to minimize API calls)
-    2. FMP Earnings Calendar API (most reliable)
-    3. yfinance calendar (fallback)
+    dates['next_earnings'] = item['date']
+    # Capture EPS estimate if available
+    eps_est = item.get('epsEstimated')
+    if eps_est:
+        dates['eps_estimated'] = eps_est
+    # Capture revenue estimate
+    rev_est = item.get('revenueEstimated')
+    if rev_est:
+        dates['revenue_estimated'] = rev_est
+    dates['source'] = 'FMP'
+    logger.debug("[FMP] Found next earnings date for %s: %s", ticker_symbol, item['date'])
+    return dates
+
+def _fetch_fmp_earnings(symbols, today):
+    """
+    Fetches FMP earnings rows grouped by (upper-cased) symbol.
+    A single symbol uses the per-symbol endpoint; several symbols share one
+    earnings-calendar request covering the next 90 days.
+    Returns {} on API errors.
     """
-    import earnings_cache_manager
-    import requests
-    import os
-    from datetime import datetime, timedelta
+    if len(symbols) == 1:
+        # FMP /stable/earnings - returns all earnings history/future for a symbol
+        url = f"https://financialmodelingprep.com/stable/earnings?symbol={symbols[0]}&apikey={_FMP_KEY}"
+    else:
+        # FMP /stable/earnings-calendar - all symbols reporting in the window
+        end = today + timedelta(days=90)
+        url = f"https://financialmodelingprep.com/stable/earnings-calendar?from={today:%Y-%m-%d}&to={end:%Y-%m-%d}&apikey={_FMP_KEY}"
     
-    # 1. Check cache first
-    cached = earnings_cache_manager.get_cached_earnings(ticker_symbol)
-    if cached is not None:
-        return cached
+    response = HTTP_SESSION.get(url, timeout=10)
+    if response.status_code != 200:
+        return {}
+    data = response.json()
     
-    dates = {}
+    # Check for API error message
+    if isinstance(data, dict) and 'Error Message' in data:
+        logger.warning("[FMP] API Error: %s", data['Error Message'])
+        return {}
+    if not isinstance(data, list) or not data:
+        return {}
     
-    # 2. Try FMP API (new /stable endpoint)
-    fmp_key = os.environ.get("FMP_API_KEY")
-    if fmp_key:
-        try:
-            # FMP /stable/earnings - returns all earnings history/future for a symbol
-            url = f"https://financialmodelingprep.com/stable/earnings?symbol={ticker_symbol.upper()}&apikey={fmp_key}"
-            
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check for API error message
-                if isinstance(data, dict) and 'Error Message' in data:
-                    print(f"[FMP] API Error: {data['Error Message']}")
-                elif isinstance(data, list) and len(data) > 0:
-                    # Find next future earnings (epsActual is null for future dates)
-                    today_str = datetime.now().strftime("%Y-%m-%d")
-                    
-                    for item in data:
-                        item_date = item.get('date', '')
-                        eps_actual = item.get('epsActual')
-                        
-                        # Future earnings: date >= today AND epsActual is null
-                        if item_date >= today_str and eps_actual is None:
-                            dates['next_earnings'] = item_date
-                            # Capture EPS estimate if available
-                            eps_est = item.get('epsEstimated')
-                            if eps_est:
-                                dates['eps_estimated'] = eps_est
-                            # Capture revenue estimate
-                            rev_est = item.get('revenueEstimated')
-                            if rev_est:
-                                dates['revenue_estimated'] = rev_est
-                            dates['source'] = 'FMP'
-                            print(f"[FMP] Found next earnings date for {ticker_symbol}: {item_date}")
-                            break
-                    
-                    # Cache the result
-                    earnings_cache_manager.save_earnings(ticker_symbol, dates)
-                    
-                    if dates.get('next_earnings'):
-                        return dates
-                        
-        except Exception as e:
-            print(f"[FMP] Error fetching earnings: {e}")
+    if len(symbols) == 1:
+        return {symbols[0]: data}
     
-    # 3. Fallback to yfinance for dividend info and as backup
+    # Group calendar rows by symbol in one pass
+    wanted = set(symbols)
+    grouped = {}
+    for item in data:
+        sym = str(item.get('symbol', '')).upper()
+        if sym in wanted:
+            grouped.setdefault(sym, []).append(item)
+    return grouped
+
+def _yf_calendar_events(ticker_symbol, dates):
+    """Fills dividend dates (and earnings, if FMP found none) from the yfinance calendar."""
     try:
-        ticker = yf.Ticker(ticker_symbol)
+        ticker = get_ticker(ticker_symbol)
         calendar = ticker.calendar
         
         if calendar is not None:
@@ -401,21 +695,69 @@ def get_calendar_events(ticker_symbol):
                     val = ex_div[0] if (isinstance(ex_div, list) or hasattr(ex_div, '__iter__')) and len(ex_div) > 0 else ex_div
                     if val: dates['ex_dividend'] = str(val)
     except Exception as e:
-        print(f"[yfinance] Error fetching calendar: {e}")
+        logger.warning("[yfinance] Error fetching calendar: %s", e)
+
+def get_calendar_events_batch(tickers):
+    """
+    Fetches major calendar events (Earnings, Dividends) for several tickers.
+    Returns a dict keyed by upper-cased ticker.
     
-    # Cache final result
-    earnings_cache_manager.save_earnings(ticker_symbol, dates)
+    Data Sources (in order):
+    1. Daily cache (to minimize API calls)
+    2. FMP Earnings API - one request for all cache misses
+    3. yfinance calendar (fallback, per ticker)
+    """
+    # 1. Check cache first
+    results = earnings_cache_manager.get_cached_earnings_many(tickers)
+    misses = [t for t, cached in results.items() if cached is None]
+    if not misses:
+        return results
     
-    return dates
+    # 2. Try FMP API (new /stable endpoints)
+    fmp_rows = {}
+    if _FMP_KEY:
+        try:
+            fmp_rows = _fetch_fmp_earnings(misses, datetime.now())
+        except Exception as e:
+            logger.warning("[FMP] Error fetching earnings: %s", e)
+    
+    today_str = datetime.now().strftime("%Y-%m-%d")
+    for ticker_symbol in misses:
+        dates = _fmp_next_earnings(fmp_rows.get(ticker_symbol, ()), ticker_symbol, today_str)
+        
+        # 3. Fallback to yfinance for dividend info and as backup
+        if not dates.get('next_earnings'):
+            _yf_calendar_events(ticker_symbol, dates)
+        
+        # Cache final result
+        earnings_cache_manager.save_earnings(ticker_symbol, dates)
+        results[ticker_symbol] = dates
+    
+    return results
+
+@coalesce
+def get_calendar_events(ticker_symbol):
+    """
+    Fetches major calendar events (Earnings, Dividends) for one ticker.
+    Thin wrapper over get_calendar_events_batch.
+    """
+    return get_calendar_events_batch([ticker_symbol])[ticker_symbol.upper()]
 
-def get_pe_band_data(ticker_symbol):
+def _tz_naive(index):
+    """Drops the timezone (keeping wall time) and pins ns resolution so merge keys match."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.astype('datetime64[ns]')
+
+@ttl_cached(_profile_cache, persist=True)
+def get_pe_band_data(ticker_symbol, dtype="float32"):
     """
     Calculates PE Band data for the last 2 years.
-    Returns a DataFrame with columns: ['Close', 'PE_15x', 'PE_20x', 'PE_25x']
+    Returns a DataFrame with columns: ['Close', 'PE_15x', 'PE_20x', 'PE_25x'] as `dtype`
     Uses yfinance earnings_dates to reconstruct historical TTM EPS.
     """
     try:
-        t = yf.Ticker(ticker_symbol)
+        t = get_ticker(ticker_symbol)
         
         # 1. Get Earnings History
         # earnings_dates 'Reported EPS' is what we need.
@@ -430,16 +772,17 @@ def get_pe_band_data(ticker_symbol):
         # 2. Calculate TTM EPS
         # TTM EPS at any point is the sum of the last 4 reported EPS.
         # We calculate rolling sum.
-        ed['TTM_EPS'] = ed['Reported EPS'].rolling(window=4).sum()
+        # 4-quarter window sum via cumsum differences (no pandas Rolling object)
+        eps = ed['Reported EPS'].to_numpy(dtype=np.float64)
+        cs = np.concatenate(([0.0], np.cumsum(eps)))
+        ttm = cs[4:] - cs[:-4]
+        ed['TTM_EPS'] = np.concatenate((np.full(min(3, len(eps)), np.nan), ttm)).astype(np.float32)
         
         # 3. Fetch Price History (2y)
         hist = t.history(period="2y")
         if hist.empty:
             return pd.DataFrame()
             
-        merged_df = pd.DataFrame(index=hist.index)
-        merged_df['Close'] = hist['Close']
-        
         # 4. Merge EPS onto Price Dates
         # We want the known TTM EPS for each day.
         # Join earnings dates to price dates.
@@ -449,32 +792,29 @@ def get_pe_band_data(ticker_symbol):
         # Create a series indexed by date for TTM EPS
         eps_series = ed['TTM_EPS']
         
-        # Reindex EPS series to match price index (union of indices first to handle gaps?)
-        # Better: use merge_asof or reindex with method='ffill'
-        # But we need to be careful about timezone. yfinance price index is usually tz-aware.
-        # earnings_dates index is also tz-aware usually.
+        # Align the sparse EPS series onto price dates with one ordered merge pass.
+        # Compare as tz-naive wall times (both indices are usually exchange-local);
+        # if both are tz-aware, bring EPS into the price index's zone first.
+        eps_idx = eps_series.index
+        if eps_idx.tz is not None and hist.index.tz is not None:
+            eps_idx = eps_idx.tz_convert(hist.index.tz)
+        price_dates = pd.DataFrame({'Date': _tz_naive(hist.index)})
+        eps_frame = pd.DataFrame({'Date': _tz_naive(eps_idx), 'TTM_EPS': eps_series.to_numpy()})
         
-        # Ensure timezone compatibility
-        if eps_series.index.tz is None and hist.index.tz is not None:
-             eps_series.index = eps_series.index.tz_localize(hist.index.tz)
-        elif eps_series.index.tz is not None and hist.index.tz is None:
-             eps_series.index = eps_series.index.tz_localize(None)
-        elif eps_series.index.tz != hist.index.tz:
-             eps_series.index = eps_series.index.tz_convert(hist.index.tz)
-             
-        # Reindex and forward fill
-        # We only want dates present in price history
-        aligned_eps = eps_series.reindex(hist.index, method='ffill')
+        # For each price date take the latest TTM EPS known on or before it
+        aligned_eps = pd.merge_asof(price_dates, eps_frame, on='Date', direction='backward')['TTM_EPS']
         
         # 5. Calculate Bands
-        merged_df['PE_15x'] = aligned_eps * 15
-        merged_df['PE_20x'] = aligned_eps * 20
-        merged_df['PE_25x'] = aligned_eps * 25
+        # One float32 (N, 3) outer product instead of three Series multiplies
+        eps_arr = aligned_eps.to_numpy(dtype=np.float32)
+        bands = np.multiply.outer(eps_arr, np.array([15., 20., 25.], dtype=np.float32))
+        merged_df = pd.DataFrame(bands, index=hist.index, columns=['PE_15x', 'PE_20x', 'PE_25x'])
+        merged_df.insert(0, 'Close', hist['Close'])
         
-        return merged_df
+        return merged_df.astype(dtype) if dtype is not None else merged_df
         
     except Exception as e:
-        print(f"Error calculating PE Band data: {e}")
+        logger.warning("Error calculating PE Band data: %s", e)
         return pd.DataFrame()
 
 
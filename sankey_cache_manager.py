@@ -1,71 +1,105 @@
 """
 Sankey Structure Cache Manager
 
-Manages persistent JSON storage for AI-inferred financial statement structures.
+Manages persistent storage for AI-inferred financial statement structures.
 Once a ticker's structure is parsed by AI, it's cached to avoid repeated API calls.
+
+Structures live in a SQLite DB (one row per ticker, WAL mode), so saving or
+invalidating a ticker is a single-row write and a lookup only deserializes
+that ticker's structure. The checked-in sankey_structures.json seeds a new DB.
 """
 
-import json
 import os
+import sqlite3
 from typing import Dict, Optional
 from datetime import datetime
 
+from storage_utils import SharedConnection, loads as _loads, dumps as _dumps
+
+DB_PATH = "sankey_structures.sqlite"
+# Legacy JSON store; imported once when the DB is first created
 CACHE_FILE = "sankey_structures.json"
 
 
-def load_cache() -> Dict:
-    """Loads the entire cache from JSON file."""
+def _import_legacy_json(conn: sqlite3.Connection) -> None:
+    """Copies entries from the legacy JSON file into a freshly created DB."""
     if not os.path.exists(CACHE_FILE):
-        return {}
+        return
     try:
-        with open(CACHE_FILE, "r") as f:
+        with open(CACHE_FILE, "rb") as f:
             content = f.read()
-            if not content:
-                return {}
-            return json.loads(content)
-    except json.JSONDecodeError:
-        print(f"Warning: JSONDecodeError in {CACHE_FILE}, returning empty cache")
-        return {}
+        cache = _loads(content) if content else {}
+    except Exception as e:
+        print(f"Warning: could not import {CACHE_FILE}: {e}")
+        return
+
+    rows = [
+        (ticker.upper(), _dumps(entry.get("structure")), entry.get("cached_at", ""))
+        for ticker, entry in cache.items()
+        if isinstance(entry, dict) and entry.get("structure")
+    ]
+    if rows:
+        conn.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", rows)
+
+
+_DB = SharedConnection(
+    DB_PATH,
+    "CREATE TABLE IF NOT EXISTS cache (ticker TEXT PRIMARY KEY, structure BLOB, cached_at TEXT)",
+    seed=_import_legacy_json,
+)
+
+
+def load_cache() -> Dict:
+    """Loads the entire cache (all tickers)."""
+    try:
+        with _DB.lock:
+            rows = _DB.get().execute("SELECT ticker, structure, cached_at FROM cache").fetchall()
     except Exception as e:
         print(f"Error loading sankey cache: {e}")
         return {}
+    return {
+        ticker: {"structure": _loads(structure), "cached_at": cached_at}
+        for ticker, structure, cached_at in rows
+    }
 
 
 def get_cached_structure(ticker: str) -> Optional[Dict]:
     """
     Retrieves cached Sankey structure for a ticker.
-    
+
     Returns:
         Dict with 'nodes' and 'links' if found, None otherwise
     """
-    cache = load_cache()
-    entry = cache.get(ticker.upper())
-    if entry:
-        return entry.get("structure")
+    try:
+        with _DB.lock:
+            row = _DB.get().execute(
+                "SELECT structure FROM cache WHERE ticker = ?", (ticker.upper(),)
+            ).fetchone()
+    except Exception as e:
+        print(f"Error loading sankey cache: {e}")
+        return None
+    if row:
+        return _loads(row[0])
     return None
 
 
 def save_structure(ticker: str, structure: Dict) -> bool:
     """
     Saves AI-inferred Sankey structure to cache.
-    
+
     Args:
         ticker: Stock ticker symbol
         structure: Dict with 'nodes' and 'links' keys
-    
+
     Returns:
         True if saved successfully, False otherwise
     """
-    cache = load_cache()
-    
-    cache[ticker.upper()] = {
-        "structure": structure,
-        "cached_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-    }
-    
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache, f, indent=2)
+        with _DB.lock:
+            _DB.get().execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                (ticker.upper(), _dumps(structure), datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
         print(f"Sankey structure cached for {ticker}")
         return True
     except Exception as e:
@@ -76,22 +110,14 @@ def save_structure(ticker: str, structure: Dict) -> bool:
 def invalidate_cache(ticker: str) -> bool:
     """
     Removes cached structure for a ticker (for manual refresh).
-    
+
     Returns:
         True if removed, False if not found or error
     """
-    cache = load_cache()
-    ticker_upper = ticker.upper()
-    
-    if ticker_upper not in cache:
-        return False
-    
-    del cache[ticker_upper]
-    
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache, f, indent=2)
-        return True
+        with _DB.lock:
+            cur = _DB.get().execute("DELETE FROM cache WHERE ticker = ?", (ticker.upper(),))
     except Exception as e:
         print(f"Error invalidating sankey cache: {e}")
         return False
+    return cur.rowcount > 0
@@ -11,47 +11,55 @@ Usage:
 """
 
 import argparse
+import logging
 import sys
 from datetime import datetime
 
+logging.basicConfig(stream=sys.stdout, level=os.getenv("LOGLEVEL", "INFO"), format="%(message)s")
+logger = logging.getLogger(__name__)
+
+# Section rules are built once rather than on every print
+RULE = "=" * 60
+HASH_RULE = "#" * 60
+
 # ============ Current Approach: yfinance + DuckDuckGo ============
 import yfinance as yf
 from duckduckgo_search import DDGS
 
 def get_data_yfinance(ticker_symbol):
     """Fetch stock data using yfinance (current approach)."""
-    print("\n" + "="*60)
-    print("📊 [Current] yfinance - Stock Data")
-    print("="*60)
+    logger.info("\n%s", RULE)
+    logger.info("📊 [Current] yfinance - Stock Data")
+    logger.info(RULE)
     
     try:
         ticker = yf.Ticker(ticker_symbol)
         info = ticker.info
         
-        print(f"Name: {info.get('shortName', 'N/A')}")
-        print(f"Sector: {info.get('sector', 'N/A')}")
-        print(f"Industry: {info.get('industry', 'N/A')}")
-        print(f"Market Cap: ${info.get('marketCap', 0):,.0f}")
-        print(f"Current Price: ${info.get('currentPrice', 0):.2f}")
-        print(f"52W High: ${info.get('fiftyTwoWeekHigh', 0):.2f}")
-        print(f"52W Low: ${info.get('fiftyTwoWeekLow', 0):.2f}")
-        print(f"PE Ratio: {info.get('trailingPE', 'N/A')}")
+        logger.info("Name: %s", info.get('shortName', 'N/A'))
+        logger.info("Sector: %s", info.get('sector', 'N/A'))
+        logger.info("Industry: %s", info.get('industry', 'N/A'))
+        logger.info("Market Cap: $%s", format(info.get('marketCap', 0), ",.0f"))
+        logger.info("Current Price: $%.2f", info.get('currentPrice', 0))
+        logger.info("52W High: $%.2f", info.get('fiftyTwoWeekHigh', 0))
+        logger.info("52W Low: $%.2f", info.get('fiftyTwoWeekLow', 0))
+        logger.info("PE Ratio: %s", info.get('trailingPE', 'N/A'))
         
         # Recent Price History
         hist = ticker.history(period="5d")
-        print("\nRecent Price History (5 days):")
-        print(hist[['Close', 'Volume']].tail())
+        logger.info("\nRecent Price History (5 days):")
+        logger.info("%s", hist[['Close', 'Volume']].tail())
         
         return info
     except Exception as e:
-        print(f"ERROR: {e}")
+        logger.error("ERROR: %s", e)
         return None
 
 def get_news_ddg(ticker_symbol):
     """Fetch news using DuckDuckGo (current approach)."""
-    print("\n" + "="*60)
-    print("📰 [Current] DuckDuckGo - News")
-    print("="*60)
+    logger.info("\n%s", RULE)
+    logger.info("📰 [Current] DuckDuckGo - News")
+    logger.info(RULE)
     
     try:
         results = DDGS().news(
@@ -64,15 +72,15 @@ def get_news_ddg(ticker_symbol):
         
         if results:
             for i, item in enumerate(results, 1):
-                print(f"\n{i}. {item.get('title', 'N/A')}")
-                print(f"   Source: {item.get('source', 'N/A')}")
-                print(f"   Date: {item.get('date', 'N/A')}")
+                logger.info("\n%s. %s", i, item.get('title', 'N/A'))
+                logger.info("   Source: %s", item.get('source', 'N/A'))
+                logger.info("   Date: %s", item.get('date', 'N/A'))
         else:
-            print("No news found.")
+            logger.warning("No news found.")
         
         return results
     except Exception as e:
-        print(f"ERROR: {e}")
+        logger.error("ERROR: %s", e)
         return []
 
 # ============ New Approach: OpenBB ============
@@ -80,9 +88,9 @@ from openbb import obb
 
 def get_data_openbb(ticker_symbol):
     """Fetch stock data using OpenBB."""
-    print("\n" + "="*60)
-    print("📊 [OpenBB] equity.profile + equity.price.historical")
-    print("="*60)
+    logger.info("\n%s", RULE)
+    logger.info("📊 [OpenBB] equity.profile + equity.price.historical")
+    logger.info(RULE)
     
     try:
         # Profile
@@ -91,30 +99,30 @@ def get_data_openbb(ticker_symbol):
         if isinstance(p, list) and p:
             p = p[0]
         
-        print(f"Name: {getattr(p, 'name', 'N/A')}")
-        print(f"Sector: {getattr(p, 'sector', 'N/A')}")
-        print(f"Industry: {getattr(p, 'industry_category', 'N/A')}")
-        print(f"Market Cap: ${getattr(p, 'market_cap', 0):,.0f}")
-        print(f"Employees: {getattr(p, 'employees', 'N/A')}")
-        print(f"Dividend Yield: {getattr(p, 'dividend_yield', 'N/A')}%")
-        print(f"Beta: {getattr(p, 'beta', 'N/A')}")
+        logger.info("Name: %s", getattr(p, 'name', 'N/A'))
+        logger.info("Sector: %s", getattr(p, 'sector', 'N/A'))
+        logger.info("Industry: %s", getattr(p, 'industry_category', 'N/A'))
+        logger.info("Market Cap: $%s", format(getattr(p, 'market_cap', 0), ",.0f"))
+        logger.info("Employees: %s", getattr(p, 'employees', 'N/A'))
+        logger.info("Dividend Yield: %s%%", getattr(p, 'dividend_yield', 'N/A'))
+        logger.info("Beta: %s", getattr(p, 'beta', 'N/A'))
         
         # Price History
         price = obb.equity.price.historical(symbol=ticker_symbol, provider="yfinance", limit=5)
         df = price.to_df()
-        print("\nRecent Price History (5 days):")
-        print(df[['close', 'volume']].tail())
+        logger.info("\nRecent Price History (5 days):")
+        logger.info("%s", df[['close', 'volume']].tail())
         
         return p
     except Exception as e:
-        print(f"ERROR: {e}")
+        logger.error("ERROR: %s", e)
         return None
 
 def get_news_openbb(ticker_symbol):
     """Fetch news using OpenBB."""
-    print("\n" + "="*60)
-    print("📰 [OpenBB] news.company (yfinance provider)")
-    print("="*60)
+    logger.info("\n%s", RULE)
+    logger.info("📰 [OpenBB] news.company (yfinance provider)")
+    logger.info(RULE)
     
     try:
         news = obb.news.company(symbol=ticker_symbol, provider="yfinance", limit=5)
@@ -125,15 +133,15 @@ def get_news_openbb(ticker_symbol):
                 title = getattr(item, 'title', 'N/A')
                 source = getattr(item, 'source', 'N/A')
                 date = getattr(item, 'date', 'N/A')
-                print(f"\n{i}. {title}")
-                print(f"   Source: {source}")
-                print(f"   Date: {date}")
+                logger.info("\n%s. %s", i, title)
+                logger.info("   Source: %s", source)
+                logger.info("   Date: %s", date)
         else:
-            print("No news found.")
+            logger.warning("No news found.")
         
         return results
     except Exception as e:
-        print(f"ERROR: {e}")
+        logger.error("ERROR: %s", e)
         return []
 
 # ============ Main ============
@@ -143,10 +151,10 @@ def main():
     args = parser.parse_args()
     
     ticker = args.ticker.upper()
-    print(f"\n{'#'*60}")
-    print(f"# Comparing Data Sources for: {ticker}")
-    print(f"# Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'#'*60}")
+    logger.info("\n%s", HASH_RULE)
+    logger.info("# Comparing Data Sources for: %s", ticker)
+    logger.info("# Time: %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info(HASH_RULE)
     
     # Current Approach
     get_data_yfinance(ticker)
@@ -156,9 +164,9 @@ def main():
     get_data_openbb(ticker)
     get_news_openbb(ticker)
     
-    print("\n" + "="*60)
-    print("✅ Comparison Complete!")
-    print("="*60)
+    logger.info("\n%s", RULE)
+    logger.info("✅ Comparison Complete!")
+    logger.info(RULE)
 
 if __name__ == "__main__":
     main()
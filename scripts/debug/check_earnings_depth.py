@@ -1,10 +1,15 @@
 
 import yfinance as yf
-t = yf.Ticker("NVDA")
+from debug_cache import cached
+
+@cached
+def get_earnings_dates(symbol):
+    return yf.Ticker(symbol).earnings_dates
+
 print("--- Earnings Dates ---")
 try:
     # earnings_dates usually has a long history of reported EPS
-    ed = t.earnings_dates
+    ed = get_earnings_dates("NVDA")
     print(ed.head())
     print(ed.tail())
     print("Columns:", ed.columns)
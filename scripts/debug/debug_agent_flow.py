@@ -7,6 +7,11 @@ sys.path.append(os.getcwd())
 from agent import StockAgent
 import utils
 import time
+from debug_cache import cached
+
+@cached
+def search_revenue_segments(ticker):
+    return utils.search_revenue_segments(ticker)
 
 def debug_agent():
     api_key = os.getenv("GEMINI_API_KEY")
@@ -17,7 +22,7 @@ def debug_agent():
     
     # Real data for extract_revenue_segments
     print(f"Searching DDG for segments...")
-    real_context = utils.search_revenue_segments(ticker)
+    real_context = search_revenue_segments(ticker)
     print(f"Found {len(real_context)} results.")
     
     print("Calling extract_revenue_segments with REAL data...")
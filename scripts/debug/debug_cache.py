@@ -0,0 +1,23 @@
+"""
+Disk cache for the debug scripts.
+
+Persists fetch results across runs so iterating on downstream logic doesn't
+re-hit Yahoo/OpenBB/DDG every time. Uses joblib.Memory when it is installed;
+otherwise (or with --no-cache on the command line) every call goes live.
+"""
+import sys
+
+try:
+    from joblib import Memory
+except ImportError:
+    Memory = None
+
+CACHE_DIR = ".cache_debug"
+NO_CACHE = "--no-cache" in sys.argv
+
+_MEM = Memory(CACHE_DIR, verbose=0) if Memory is not None and not NO_CACHE else None
+
+
+def cached(fn):
+    """Decorator: memoizes fn's (picklable) result on disk, keyed on its arguments and source."""
+    return _MEM.cache(fn) if _MEM is not None else fn
@@ -5,34 +5,31 @@ sys.path.append(os.getcwd())
 import utils
 import pandas as pd
 import time
+from debug_cache import cached
+
+@cached
+def get_financials(ticker_symbol):
+    # Keyed on the symbol: the yf.Ticker object itself isn't a stable cache key
+    return utils.get_financials(utils.obb_utils.get_ticker(ticker_symbol))
 
 def debug_flow():
     ticker_symbol = "CAVA"
-    print(f"--- 1. Getting Stock Data for {ticker_symbol} ---")
+    print(f"--- 1. Getting Stock Data, News & History for {ticker_symbol} (concurrent) ---")
     start = time.time()
-    ticker, error = utils.get_stock_data(ticker_symbol)
+    (ticker, error), news, hist = utils.prefetch_ticker(ticker_symbol)
     print(f"Done in {time.time() - start:.2f}s. Error: {error}")
     
     if error:
         return
+    print(f"News Items: {len(news)}, History Rows: {len(hist)}")
 
-    print("\n--- 2. Getting News ---")
-    start = time.time()
-    news = utils.get_news(ticker_symbol)
-    print(f"Done in {time.time() - start:.2f}s. Items: {len(news)}")
-
-    print("\n--- 3. Getting Financials ---")
+    print("\n--- 2. Getting Financials ---")
     start = time.time()
-    financials = utils.get_financials(ticker)
+    financials = get_financials(ticker_symbol)
     inc = financials.get('income_stmt')
     print(f"Done in {time.time() - start:.2f}s. Income Stmt Empty? {inc.empty if inc is not None else 'True'}")
 
-    print("\n--- 4. Getting Historical Data ---")
-    start = time.time()
-    hist = utils.get_historical_data(ticker)
-    print(f"Done in {time.time() - start:.2f}s. Rows: {len(hist)}")
-
-    print("\n--- 5. Getting Sankey Data ---")
+    print("\n--- 3. Getting Sankey Data ---")
     start = time.time()
     # Mock segments json
     segments_json = "[]"
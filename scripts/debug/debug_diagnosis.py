@@ -1,44 +1,50 @@
 from openbb import obb
 import yfinance as yf
 import json
+import logging
+import os
+import sys
 
-print("\n--- DIAGNOSIS: NEWS (NVDA) ---")
+logging.basicConfig(stream=sys.stdout, level=os.getenv("LOGLEVEL", "INFO"), format="%(message)s")
+logger = logging.getLogger(__name__)
+
+logger.info("\n--- DIAGNOSIS: NEWS (NVDA) ---")
 try:
     # Try fetching news via OBB
     # Note: If openbb-news is not installed yet, this will fail or return None/Empty
     res = obb.news.company(symbol="NVDA", provider="yfinance", limit=3)
-    print(f"OBB News Result Type: {type(res)}")
+    logger.info("OBB News Result Type: %s", type(res))
     if res and res.results:
-        print(f"Count: {len(res.results)}")
-        print("First Item Raw:")
+        logger.info("Count: %s", len(res.results))
+        logger.info("First Item Raw:")
         # Dump the first item's dict if possible
         try:
-            print(res.results[0].model_dump())
+            logger.info("%s", res.results[0].model_dump())
         except:
-            print(res.results[0])
+            logger.info("%s", res.results[0])
     else:
-        print("OBB returned NO results.")
+        logger.warning("OBB returned NO results.")
 except Exception as e:
-    print(f"OBB News Error: {e}")
+    logger.error("OBB News Error: %s", e)
 
-print("\n--- DIAGNOSIS: CALENDAR (NVDA) ---")
+logger.info("\n--- DIAGNOSIS: CALENDAR (NVDA) ---")
 try:
     t = yf.Ticker("NVDA")
     cal = t.calendar
-    print(f"Calendar Type: {type(cal)}")
-    print("Content:")
-    print(cal)
+    logger.info("Calendar Type: %s", type(cal))
+    logger.info("Content:")
+    logger.info("%s", cal)
     
     # Test accessor logic from obb_utils.py
     if isinstance(cal, dict):
-        print("Is Dict. Keys:", cal.keys())
-        print("Earnings Date val:", cal.get("Earnings Date"))
+        logger.info("Is Dict. Keys: %s", cal.keys())
+        logger.info("Earnings Date val: %s", cal.get("Earnings Date"))
     else:
-        print("Is likely DataFrame.")
+        logger.info("Is likely DataFrame.")
         if hasattr(cal, "index"):
-            print("Index:", cal.index)
+            logger.info("Index: %s", cal.index)
         if hasattr(cal, "columns"):
-            print("Columns:", cal.columns)
+            logger.info("Columns: %s", cal.columns)
             
 except Exception as e:
-    print(f"Calendar Error: {e}")
+    logger.error("Calendar Error: %s", e)
@@ -1,14 +1,32 @@
 
 import yfinance as yf
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from debug_cache import cached
+
+@cached
+def get_earnings_dates(symbol):
+    return yf.Ticker(symbol).earnings_dates
+
+def fetch_earnings_dates(symbol):
+    """Returns (earnings_dates, error) so one failure doesn't abort the batch."""
+    try:
+        return get_earnings_dates(symbol), None
+    except Exception as e:
+        return None, e
 
 tickers = ["NVDA", "CAVA", "TSLA"]
 
+# Fetch every symbol concurrently up front, then print in order
+with ThreadPoolExecutor(max_workers=len(tickers)) as ex:
+    fetched = dict(zip(tickers, ex.map(fetch_earnings_dates, tickers)))
+
 for symbol in tickers:
     print(f"\n\n=== DEBUGGING {symbol} ===")
     try:
-        t = yf.Ticker(symbol)
-        ed = t.earnings_dates
+        ed, error = fetched[symbol]
+        if error:
+            raise error
         if ed is None or ed.empty:
             print("Earnings dates is EMPTY or None")
             continue
@@ -4,6 +4,14 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from duckduckgo_search import DDGS
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+def _run(q):
+    """Runs one text query; returns (results, error)."""
+    try:
+        return list(DDGS().text(keywords=q, region="us-en", safesearch="off", max_results=3)), None
+    except Exception as e:
+        return [], e
 
 def test_search():
     ticker = "ONDS"
@@ -16,15 +24,18 @@ def test_search():
         f"{ticker} earnings call date marketbeat nasdaq"
     ]
 
-    for q in queries:
+    # The variants are independent network calls: run them side by side
+    with ThreadPoolExecutor(max_workers=len(queries)) as ex:
+        outcomes = list(ex.map(_run, queries))
+
+    for q, (results, error) in zip(queries, outcomes):
         print(f"\nQuery: '{q}'")
-        try:
-            results = list(DDGS().text(keywords=q, region="us-en", safesearch="off", max_results=3))
-            for res in results:
-                print(f"- [{res.get('title')}]")
-                print(f"  Snippet: {res.get('body')}")
-        except Exception as e:
-            print(f"Error: {e}")
+        if error:
+            print(f"Error: {error}")
+            continue
+        for res in results:
+            print(f"- [{res.get('title')}]")
+            print(f"  Snippet: {res.get('body')}")
 
 if __name__ == "__main__":
     test_search()
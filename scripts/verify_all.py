@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+"""
+Runs the verify scripts in one process, so pandas/OpenBB/utils are imported once
+instead of once per script.
+
+Usage:
+    python scripts/verify_all.py
+"""
+import time
+
+from verify_migration import verify_migration
+from verify_event_fix import verify
+from verify_tiingo import verify_tiingo
+from poc_openbb_light import test_openbb_light
+
+CHECKS = [
+    ("verify_migration", verify_migration),
+    ("verify_event_fix", verify),
+    ("verify_tiingo", verify_tiingo),
+    ("poc_openbb_light", test_openbb_light),
+]
+
+def verify_all():
+    for name, check in CHECKS:
+        print(f"\n{'#' * 60}\n# {name}\n{'#' * 60}")
+        start = time.perf_counter()
+        try:
+            check()
+        except Exception as e:
+            print(f"❌ {name} raised {type(e).__name__}: {e}")
+        print(f"({name}: {time.perf_counter() - start:.1f}s)")
+
+if __name__ == "__main__":
+    verify_all()
@@ -4,6 +4,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import utils
 import json
+import pandas as pd
 
 def verify():
     ticker = "ONDS"
@@ -15,16 +16,17 @@ def verify():
         results = utils.search_key_events(ticker)
         print(f"Total Results: {len(results)}")
         
-        found_earnings_keyword = False
-        for i, res in enumerate(results):
-            title = res.get('title', '')
-            snippet = res.get('body', '')
-            source = res.get('source', 'Web')
+        df = pd.DataFrame(results).reindex(columns=['title', 'body', 'source'])
+        # Missing keys come back as NaN columns; make them strings for the .str scans
+        df[['title', 'body']] = df[['title', 'body']].fillna('').astype(str)
+        df['source'] = df['source'].fillna('Web')
+        for i, (title, source) in enumerate(zip(df['title'], df['source'])):
             print(f"[{i+1}] {title} ({source})")
-            
-            # Check for earnings keywords
-            if "earnings" in title.lower() or "earnings" in snippet.lower():
-                found_earnings_keyword = True
+        
+        # Check for earnings keywords (one vectorized pass per column)
+        mask = df['title'].str.contains('earnings', case=False, regex=False) | \
+               df['body'].str.contains('earnings', case=False, regex=False)
+        found_earnings_keyword = bool(mask.any())
                 
         if found_earnings_keyword:
             print("\n✅ SUCCESS: 'Earnings' related content found in results.")
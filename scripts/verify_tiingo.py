@@ -4,17 +4,28 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import os
 from dotenv import load_dotenv
 load_dotenv()
+from concurrent.futures import ThreadPoolExecutor
 from obb_utils import get_news
 
-print(f"TIINGO_API_KEY present: {'TIINGO_API_KEY' in os.environ}")
+def verify_tiingo(symbols=("AAPL",)):
+    symbols = list(symbols)
+    print(f"TIINGO_API_KEY present: {'TIINGO_API_KEY' in os.environ}")
 
-symbol = "AAPL"
-print(f"Fetching news for {symbol}...")
-news = get_news(symbol, limit=5)
+    print(f"Fetching news for {', '.join(symbols)}...")
 
-if news:
-    print(f"Found {len(news)} news items.")
-    for item in news:
-        print(f"- [{item.get('source')}] {item.get('title')}")
-else:
-    print("No news found.")
+    # Symbols are independent: fetch them together, report in order
+    with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+        results = list(executor.map(lambda s: get_news(s, limit=5), symbols))
+
+    for symbol, news in zip(symbols, results):
+        if len(symbols) > 1:
+            print(f"\n{symbol}:")
+        if news:
+            print(f"Found {len(news)} news items.")
+            for item in news:
+                print(f"- [{item.get('source')}] {item.get('title')}")
+        else:
+            print("No news found.")
+
+if __name__ == "__main__":
+    verify_tiingo(sys.argv[1:] or ["AAPL"])
@@ -0,0 +1,58 @@
+"""
+Shared helpers for the on-disk stores (earnings cache, Sankey cache, theses log).
+
+JSON goes through orjson when it is installed, with the stdlib as fallback.
+The SQLite-backed caches share one lazily opened connection each (SharedConnection).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(raw):
+    """Parses JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(obj) -> bytes:
+    """Serializes to compact, single-line JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+class SharedConnection:
+    """
+    One SQLite connection (WAL mode) shared by every thread of a store, opened on first use.
+    sqlite3 connections aren't thread-safe by default, so callers hold .lock around each use.
+    seed(conn) runs once when the DB file is first created (e.g. to import a legacy store).
+    """
+
+    def __init__(self, path, schema, seed=None):
+        self.path = path
+        self.schema = schema
+        self.seed = seed
+        self.lock = threading.Lock()
+        self._conn = None
+
+    def get(self) -> sqlite3.Connection:
+        """Returns the connection, creating the DB and schema on first use. Caller holds .lock."""
+        if self._conn is None:
+            is_new = not os.path.exists(self.path)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(self.schema)
+            if is_new and self.seed is not None:
+                self.seed(conn)
+            self._conn = conn
+        return self._conn
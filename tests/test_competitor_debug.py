@@ -7,20 +7,21 @@ import google.generativeai as genai
 import json
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
+# Leading ```json / ``` fence or trailing ``` fence
+_FENCE_RE = re.compile(r'\A```(?:json)?|```\Z')
+
 def clean_json_text(text):
     """Extract JSON from text that might have markdown fencing"""
     if not text:
         return text
-    text = text.strip()
-    if text.startswith("```json"):
-        text = text[7:]
-    elif text.startswith("```"):
-        text = text[3:]
-    if text.endswith("```"):
-        text = text[:-3]
-    return text.strip()
+    return _FENCE_RE.sub('', text.strip()).strip()
 
 api_key = os.getenv("GEMINI_API_KEY")
 if not api_key:
@@ -30,9 +31,8 @@ if not api_key:
 genai.configure(api_key=api_key)
 model = genai.GenerativeModel('gemini-3-flash-preview')
 
-ticker = "ONDS"
-
-prompt = f"""
+def check_competitors(model, ticker):
+    prompt = f"""
 Identify the top 4 public company competitors or industry peers for {ticker}.
 
 IMPORTANT RULES:
@@ -48,32 +48,38 @@ Return ONLY a valid JSON list of ticker symbols.
 Example: ["TICKER1", "TICKER2", "TICKER3", "TICKER4"]
 """
 
-print(f"Testing competitor identification for {ticker}...")
-print("="*50)
-print("Prompt sent:")
-print(prompt)
-print("="*50)
-
-try:
-    response = model.generate_content(prompt)
-    raw_response = response.text
-    print(f"\nRaw AI Response:")
-    print(raw_response)
+    print(f"Testing competitor identification for {ticker}...")
     print("="*50)
-    
-    cleaned = clean_json_text(raw_response)
-    print(f"\nCleaned Response:")
-    print(cleaned)
+    print("Prompt sent:")
+    print(prompt)
     print("="*50)
+
+    try:
+        response = model.generate_content(prompt)
+        raw_response = response.text
+        print(f"\nRaw AI Response:")
+        print(raw_response)
+        print("="*50)
+    
+        cleaned = clean_json_text(raw_response)
+        print(f"\nCleaned Response:")
+        print(cleaned)
+        print("="*50)
     
-    result = json.loads(cleaned)
-    print(f"\nParsed Result: {result}")
-    print(f"Type: {type(result)}")
+        result = orjson.loads(cleaned) if orjson is not None else json.loads(cleaned)
+        print(f"\nParsed Result: {result}")
+        print(f"Type: {type(result)}")
     
-    if isinstance(result, list) and all(isinstance(t, str) for t in result):
-        print(f"\n✅ SUCCESS: Found {len(result)} competitors: {result}")
-    else:
-        print(f"\n❌ INVALID: Result is not a list of strings")
+        if isinstance(result, list) and all(isinstance(t, str) for t in result):
+            print(f"\n✅ SUCCESS: Found {len(result)} competitors: {result}")
+        else:
+            print(f"\n❌ INVALID: Result is not a list of strings")
         
-except Exception as e:
-    print(f"\n❌ ERROR: {type(e).__name__}: {e}")
+    except Exception as e:
+        print(f"\n❌ ERROR: {type(e).__name__}: {e}")
+
+TICKERS = ["ONDS"]
+
+# One model instance is shared by every ticker's check
+for ticker in TICKERS:
+    check_competitors(model, ticker)
@@ -1,11 +1,20 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from duckduckgo_search import DDGS
+from concurrent.futures import ThreadPoolExecutor
 import json
 
-def test_search(ticker):
+# Pooled DDGS clients, so repeated searches reuse their connections
+from obb_utils import ddgs_news
+
+def fetch_results(ticker):
     query = f"{ticker} financial results analysis revenue profit drivers"
+    results = ddgs_news(keywords=query, region="us-en", safesearch="off", timelimit="y", max_results=5)
+    return query, results
+
+def print_results(query, results):
     print(f"Searching for: {query}")
-    results = list(DDGS().news(keywords=query, region="us-en", safesearch="off", timelimit="y", max_results=5))
     for i, r in enumerate(results):
         print(f"--- Result {i+1} ---")
         print(f"Title: {r.get('title')}")
@@ -13,5 +22,14 @@ def test_search(ticker):
         print(f"URL: {r.get('url')}")
         print("-" * 20)
 
+def test_search(ticker):
+    print_results(*fetch_results(ticker))
+
+def search_many(tickers):
+    """Runs the searches concurrently and prints them in input order."""
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        for query, results in ex.map(fetch_results, tickers):
+            print_results(query, results)
+
 if __name__ == "__main__":
-    test_search("CAVA")
+    search_many(sys.argv[1:] or ["CAVA"])
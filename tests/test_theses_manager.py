@@ -0,0 +1,123 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+
+import pytest
+
+import theses_manager
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    """Runs each test against an empty store in its own directory with a cold cache."""
+    monkeypatch.chdir(tmp_path)
+    theses_manager._set_cache(None, {}, 0)
+    yield tmp_path
+    theses_manager._set_cache(None, {}, 0)
+
+
+def reload_theses():
+    """Forces a replay of the log from disk."""
+    theses_manager._set_cache(None, {}, 0)
+    return theses_manager.load_theses()
+
+
+def log_lines():
+    with open(theses_manager.THESES_FILE, "rb") as f:
+        return f.read().splitlines()
+
+
+def new_thesis(ticker, statement):
+    thesis = theses_manager.get_empty_thesis_template(ticker)
+    thesis["thesis_statement"] = statement
+    return thesis
+
+
+def test_save_update_delete_replay():
+    ok, first = theses_manager.save_thesis(new_thesis("AAPL", "Services grow"))
+    assert ok
+    ok, second = theses_manager.save_thesis(new_thesis("MSFT", "Azure grows"))
+    assert ok
+
+    update = new_thesis("AAPL", "Services keep growing")
+    update["id"] = first
+    assert theses_manager.save_thesis(update)[0]
+
+    theses = reload_theses()
+    assert [t["id"] for t in theses] == [first, second]
+    assert theses[0]["thesis_statement"] == "Services keep growing"
+    # created_at survives an edit that doesn't carry it
+    assert theses[0]["created_at"]
+    assert theses[0]["verification_date"]
+
+    assert theses_manager.delete_thesis(first)
+    assert not theses_manager.delete_thesis("missing-id")
+    assert [t["id"] for t in reload_theses()] == [second]
+
+
+def test_duplicate_content_updates_existing():
+    _, first = theses_manager.save_thesis(new_thesis("AAPL", "Services grow"))
+    _, again = theses_manager.save_thesis(new_thesis("AAPL", "  Services grow  "))
+    _, other = theses_manager.save_thesis(new_thesis("MSFT", "Services grow"))
+
+    assert again == first
+    assert other != first
+    assert len(reload_theses()) == 2
+
+
+def test_tombstone_survives_reload():
+    _, thesis_id = theses_manager.save_thesis(new_thesis("AAPL", "Services grow"))
+    assert theses_manager.delete_thesis(thesis_id)
+
+    records = [json.loads(line) for line in log_lines()]
+    assert records[-1] == {"id": thesis_id, "_deleted": True}
+    assert reload_theses() == []
+
+
+def test_compaction_after_slack(monkeypatch):
+    monkeypatch.setattr(theses_manager, "COMPACT_SLACK", 3)
+    thesis = new_thesis("AAPL", "Services grow")
+    _, thesis_id = theses_manager.save_thesis(thesis)
+    for i in range(10):
+        thesis = new_thesis("AAPL", f"Revision {i}")
+        thesis["id"] = thesis_id
+        theses_manager.save_thesis(thesis)
+
+    # Never more than live theses + slack lines, and compaction keeps the latest record
+    assert len(log_lines()) <= 1 + 3
+    theses = reload_theses()
+    assert len(theses) == 1
+    assert theses[0]["thesis_statement"] == "Revision 9"
+
+
+def test_torn_line_skipped_then_repaired():
+    _, kept = theses_manager.save_thesis(new_thesis("AAPL", "Services grow"))
+    with open(theses_manager.THESES_FILE, "ab") as f:
+        f.write(b'{"id": "torn", "ticker": "TS')
+
+    assert [t["id"] for t in reload_theses()] == [kept]
+
+    ok, saved = theses_manager.save_thesis(new_thesis("MSFT", "Azure grows"))
+    assert ok
+    assert [t["id"] for t in reload_theses()] == [kept, saved]
+    assert json.loads(log_lines()[-1])["id"] == saved
+
+
+def test_legacy_json_imported_once():
+    legacy = [
+        {"id": "a", "ticker": "AAPL", "thesis_statement": "Services grow"},
+        {"id": "b", "ticker": "MSFT", "thesis_statement": "Azure grows"},
+    ]
+    with open(theses_manager.LEGACY_THESES_FILE, "w") as f:
+        json.dump(legacy, f)
+
+    assert [t["id"] for t in theses_manager.load_theses()] == ["a", "b"]
+    assert len(log_lines()) == 2
+
+    # Once the log exists the legacy file is ignored
+    with open(theses_manager.LEGACY_THESES_FILE, "w") as f:
+        json.dump(legacy + [{"id": "c", "ticker": "X", "thesis_statement": "x"}], f)
+    assert theses_manager.delete_thesis("a")
+    assert [t["id"] for t in reload_theses()] == ["b"]
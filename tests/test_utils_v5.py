@@ -17,9 +17,9 @@ def test_fetch_v5():
     fin = utils.get_financials(ticker)
     
     inc = fin.get('income_stmt')
+    info = fin.get('info') or {}
     if not inc.empty:
         # Check EPS and Gross Profit existence in info or table
-        info = fin.get('info', {})
         if 'trailingEps' in info:
             print(f"SUCCESS: EPS found: {info['trailingEps']}")
         else:
@@ -1,34 +1,196 @@
+import copy
+import functools
 import json
+import mmap
 import os
+import threading
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
-THESES_FILE = "theses.json"
+from storage_utils import loads as _loads, dumps as _dumps
 
-def load_theses():
-    """Loads the existing theses from the JSON file."""
-    if not os.path.exists(THESES_FILE):
-        return []
+# Append-only JSON Lines log: one thesis per line, later lines supersede earlier ones
+# with the same id and {"id": ..., "_deleted": true} removes one. A save writes one
+# line instead of re-serializing every thesis.
+THESES_FILE = "theses.jsonl"
+# Whole-list JSON file written by earlier versions; imported when the log is first created
+LEGACY_THESES_FILE = "theses.json"
+# Rewrite the log once it holds this many more lines than live theses
+COMPACT_SLACK = 50
+# Logs at least this large are memory-mapped on load; smaller ones are cheaper to read whole
+MMAP_MIN_SIZE = 64 * 1024
+
+# Last replayed theses, keyed on the file's mtime so external edits are picked up.
+# by_id (id -> thesis, in saved order) and by_content ((ticker, statement) -> id) are
+# built once per replay and kept up to date by each save/delete.
+_cache = {"mtime": None, "data": None, "lines": 0, "by_id": {}, "by_content": {}}
+# Streamlit runs sessions on separate threads of one process: every load and
+# read-modify-append of the cache runs under this lock, so no save works from a
+# snapshot another save has already superseded. Reentrant because saves call load_theses.
+_LOCK = threading.RLock()
+
+def _locked(fn):
+    """Runs fn while holding _LOCK."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _LOCK:
+            return fn(*args, **kwargs)
+    return wrapper
+
+# Days until a thesis should be re-checked, by time horizon
+HORIZON_DAYS = {
+    "1-3 Months": 90,
+    "3-6 Months": 180,
+    "6-12 Months": 365,
+    "1+ Year": 365 # Default to 1Y
+}
+
+def compute_verification_date(created_at, time_horizon):
+    """
+    Returns the YYYY-MM-DD date a thesis should be re-checked by,
+    or None if created_at can't be parsed.
+    """
+    try:
+        created_dt = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return None
+    days = HORIZON_DAYS.get(time_horizon, 180)
+    return (created_dt + timedelta(days=days)).strftime("%Y-%m-%d")
+
+def _import_legacy_json():
+    """Seeds a new log from the legacy theses.json, if present."""
+    if not os.path.exists(LEGACY_THESES_FILE):
+        return
+    with open(LEGACY_THESES_FILE, "rb") as f:
+        content = f.read()
+    _write_theses(_loads(content) if content else [])
+
+def _content_key(thesis):
+    """De-duplication key: same ticker and same statement (ignoring outer whitespace)."""
+    return (thesis.get('ticker'), (thesis.get('thesis_statement') or '').strip())
+
+def _set_cache(mtime, by_id, lines, by_content=None):
+    """Stores a new file version; by_content is rebuilt when not supplied."""
+    if by_content is None:
+        by_content = {}
+        for tid, t in by_id.items():
+            by_content.setdefault(_content_key(t), tid)
+    _cache.update(mtime=mtime, data=list(by_id.values()), lines=lines, by_id=by_id, by_content=by_content)
+
+def _replay(log_lines):
+    """Folds log lines into {id: thesis} (in first-saved order) and returns (by_id, line_count)."""
+    by_id = {}
+    lines = 0
+    for line in log_lines:
+        if not line.strip():
+            continue
+        lines += 1
+        try:
+            record = _loads(line)
+        except json.JSONDecodeError:
+            # A torn last line from an interrupted append; the rest of the log is intact
+            print("JSON Decode Error in load_theses, skipping line")
+            continue
+        if record.get("_deleted"):
+            by_id.pop(record.get("id"), None)
+        else:
+            by_id[record.get("id")] = record
+    return by_id, lines
+
+@_locked
+def load_theses(readonly=False):
+    """
+    Loads the existing theses from the log (replayed only when the file changes).
+    readonly=True returns the cached list itself, skipping the copy; callers must not mutate it.
+    """
     try:
-        with open(THESES_FILE, "r") as f:
-            content = f.read()
-            if not content: return []
-            return json.loads(content)
+        if not os.path.exists(THESES_FILE):
+            _import_legacy_json()
+            if not os.path.exists(THESES_FILE):
+                _set_cache(None, {}, 0)
+                return []
+        mtime = os.stat(THESES_FILE).st_mtime_ns
+        if mtime != _cache["mtime"]:
+            by_id, lines = _read_log()
+            _set_cache(mtime, by_id, lines)
+        # Other callers may mutate the list they get back, so they get a copy
+        return _cache["data"] if readonly else copy.deepcopy(_cache["data"])
     except json.JSONDecodeError:
         print("JSON Decode Error in load_theses")
+        _set_cache(None, {}, 0)
         return []
     except Exception as e:
         print(f"Error loading theses: {e}")
         # Return None to indicate failure, so we don't overwrite with empty
         return None
 
-def save_thesis(thesis_data):
+def _write_theses(theses):
+    """
+    Rewrites the log with one line per thesis and refreshes the in-memory copy.
+    The file is swapped in atomically, so a crash mid-write never leaves it truncated.
+    """
+    tmp = THESES_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"".join(_dumps(t) + b"\n" for t in theses))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, THESES_FILE)
+    by_id = {t.get("id"): t for t in copy.deepcopy(theses)}
+    _set_cache(os.stat(THESES_FILE).st_mtime_ns, by_id, len(theses))
+
+def _read_log():
+    """Replays the log file from disk and returns (by_id, line_count)."""
+    with open(THESES_FILE, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return _replay(f.read().splitlines())
+        # Lines are read straight from the page cache; the whole file is never copied at once
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _replay(iter(mm.readline, b""))
+
+def _append_record(record, by_id, by_content):
+    """
+    Appends one record to the log; by_id/by_content are copies of the cached indexes
+    with the record already applied, used to refresh the cache. Once the log is mostly
+    superseded lines it is compacted from a fresh replay of the file, never from memory,
+    so a record appended by another process can't be dropped.
+    """
+    lines = _cache["lines"] + 1
+    line = _dumps(record) + b"\n"
+    with open(THESES_FILE, "a+b") as f:
+        # Terminate a torn last line (interrupted append) so this record starts on its own line
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    if lines > len(by_id) + COMPACT_SLACK:
+        _write_theses(list(_read_log()[0].values()))
+        return
+    # Only the saved record can be shared with the caller; the other entries are already cached objects
+    if not record.get("_deleted"):
+        by_id[record["id"]] = copy.deepcopy(record)
+    _set_cache(os.stat(THESES_FILE).st_mtime_ns, by_id, lines, by_content)
+
+def _drop_content_key(by_content, thesis):
+    """Removes thesis from the content index if it is the entry recorded there."""
+    key = _content_key(thesis)
+    if by_content.get(key) == thesis.get("id"):
+        del by_content[key]
+
+@_locked
+def save_thesis(thesis_data, now_str=None):
     """
     Saves a new thesis or updates an existing one.
     thesis_data should be a dict. If it has an 'id', it updates.
     Otherwise, it creates a new ID.
+    now_str ("YYYY-MM-DD HH:MM:SS") lets batch callers stamp every save with one timestamp.
     """
-    theses = load_theses()
+    if now_str is None:
+        now_str = datetime.now().isoformat(sep=" ", timespec="seconds")
+    # Refreshes the cache (and its indexes) if the file changed
+    theses = load_theses(readonly=True)
     if theses is None: theses = [] # Fallback or handle error? 
     # Actually, if load fails, we risk overwriting. 
     # But for now, let's assume if it fails it's likely corrupt or locked.
@@ -41,54 +203,59 @@ def save_thesis(thesis_data):
     if theses is None:
         return False, "Failed to load existing theses (File Access Error)."
 
+    # Entries are replaced, never mutated, so shallow copies of the indexes are enough
+    by_id = dict(_cache["by_id"])
+    by_content = dict(_cache["by_content"])
+
     if "id" not in thesis_data or not thesis_data["id"]:
-        is_new = True
         # Content-based de-duplication: check if same content exists for this ticker
-        for i, t in enumerate(theses):
-            if t['ticker'] == thesis_data['ticker'] and \
-               t['thesis_statement'].strip() == thesis_data['thesis_statement'].strip():
-                # Found exact duplicate: switch to "update" mode for this record
-                thesis_data['id'] = t['id']
-                thesis_data['updated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                theses[i] = thesis_data
-                is_new = False
-                break
-        
-        if is_new:
+        dup_id = by_content.get(_content_key(thesis_data))
+        if dup_id is not None:
+            # Found exact duplicate: switch to "update" mode for this record
+            thesis_data['id'] = dup_id
+            thesis_data['updated_at'] = now_str
+        else:
             thesis_data["id"] = str(uuid.uuid4())
-            thesis_data["created_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            theses.append(thesis_data)
+            thesis_data["created_at"] = now_str
     else:
-        thesis_data["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        found = False
-        for i, t in enumerate(theses):
-            if t["id"] == thesis_data["id"]:
-                theses[i] = thesis_data
-                found = True
-                break
-        if not found: theses.append(thesis_data) # recover if id exists but not found
+        thesis_data["updated_at"] = now_str
+        t = by_id.get(thesis_data["id"])
+        # Edits from the dashboard form don't carry created_at; keep the original
+        if t is not None and not thesis_data.get("created_at") and t.get("created_at"):
+            thesis_data["created_at"] = t["created_at"]
+    # (an id that isn't found is added as a new entry)
+
+    old = by_id.get(thesis_data["id"])
+    if old is not None:
+        _drop_content_key(by_content, old)
+    by_id[thesis_data["id"]] = thesis_data
+    by_content.setdefault(_content_key(thesis_data), thesis_data["id"])
+    
+    # Precompute the check-by date so the journal doesn't parse dates on every render
+    if thesis_data.get("created_at"):
+        thesis_data["verification_date"] = compute_verification_date(thesis_data["created_at"], thesis_data.get("time_horizon"))
     
     try:
-        with open(THESES_FILE, "w") as f:
-            json.dump(theses, f, indent=4)
+        _append_record(thesis_data, by_id, by_content)
         return True, thesis_data["id"]
     except Exception as e:
         return False, str(e)
 
+@_locked
 def delete_thesis(thesis_id):
     """Deletes a thesis by ID."""
-    theses = load_theses()
+    theses = load_theses(readonly=True)
     if theses is None: return False # Protect against clearing file on load error
     
-    original_len = len(theses)
-    theses = [t for t in theses if t["id"] != thesis_id]
-    
-    if len(theses) == original_len:
+    by_id = dict(_cache["by_id"])
+    old = by_id.pop(thesis_id, None)
+    if old is None:
         return False # ID not found?
+    by_content = dict(_cache["by_content"])
+    _drop_content_key(by_content, old)
     
     try:
-        with open(THESES_FILE, "w") as f:
-            json.dump(theses, f, indent=4)
+        _append_record({"id": thesis_id, "_deleted": True}, by_id, by_content)
         return True
     except Exception as e:
         return False
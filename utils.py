@@ -1,12 +1,20 @@
 import yfinance as yf
 import pandas as pd
 import ta
-from duckduckgo_search import DDGS # Restored for Deep Search
 import obb_utils
 import json
 
 import os
-import requests
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+try:
+    # Optional: compiled RSI recurrence. Falls back to the 'ta' library if numba isn't installed.
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 
 def get_stock_data(ticker_symbol):
@@ -27,8 +35,15 @@ def get_news(ticker_symbol):
     """
     return obb_utils.get_news(ticker_symbol)
 
+def prefetch_ticker(ticker_symbol):
+    """
+    Fetches stock data, news and history concurrently.
+    Returns ((ticker_obj, error), news, history_df).
+    """
+    return obb_utils.prefetch_ticker(ticker_symbol)
 
 
+@lru_cache(maxsize=1024)
 def format_large_number(num):
     """
     Formats a large number into readable string with suffix (T, B, M, K).
@@ -59,7 +74,7 @@ def search_earnings_context(ticker_symbol):
     try:
         # Get company name for better search coverage
         try:
-            ticker_obj = yf.Ticker(ticker_symbol)
+            ticker_obj = obb_utils.get_ticker(ticker_symbol)
             info = ticker_obj.info
             company_name = info.get('shortName', ticker_symbol)
             sector = info.get('sector', '')
@@ -87,7 +102,7 @@ def search_earnings_context(ticker_symbol):
         for query in search_queries:
             try:
                 # Use web search for broader coverage (not just news)
-                web_results = list(DDGS().text(
+                web_results = list(obb_utils.ddgs_text(
                     keywords=query, 
                     region="us-en", 
                     safesearch="off",
@@ -112,7 +127,7 @@ def search_earnings_context(ticker_symbol):
         
         # Also run news search for recent coverage
         try:
-            news_results = DDGS().news(
+            news_results = obb_utils.ddgs_news(
                 keywords=f"{ticker_symbol} OR \"{company_name}\" earnings",
                 region="us-en", 
                 safesearch="off", 
@@ -160,14 +175,14 @@ def search_key_events(ticker_symbol):
         # 1. Broad Web Search for Specific Dates (Calendars, Earnings)
         # Targeted for sites like Nasdaq, MarketBeat, Yahoo Finance
         query_date = f"{ticker_symbol} next earnings date"
-        web_results = list(DDGS().text(keywords=query_date, region="us-en", safesearch="off", max_results=4))
+        web_results = list(obb_utils.ddgs_text(keywords=query_date, region="us-en", safesearch="off", max_results=4))
         print(f"DEBUG: '{query_date}' -> {len(web_results)} results")
         if web_results:
              results.extend(web_results)
         
         # 2. News Search for Recent/Upcoming Developments
         query_news = f"{ticker_symbol} corporate news product launch FDA approval"
-        news_results = DDGS().news(keywords=query_news, region="us-en", safesearch="off", max_results=3)
+        news_results = obb_utils.ddgs_news(keywords=query_news, region="us-en", safesearch="off", max_results=3)
         if news_results:
              results.extend(news_results)
              
@@ -184,7 +199,7 @@ def search_financial_analysis(ticker_symbol):
     """
     try:
         query = f"{ticker_symbol} financial results analysis revenue profit drivers"
-        results = DDGS().news(keywords=query, region="us-en", safesearch="off", timelimit="y", max_results=5)
+        results = obb_utils.ddgs_news(keywords=query, region="us-en", safesearch="off", timelimit="y", max_results=5)
         return results
     except Exception as e:
         print(f"Error searching financial analysis: {e}")
@@ -198,7 +213,7 @@ def search_revenue_segments(ticker_symbol):
     """
     try:
         query = f"{ticker_symbol} revenue breakdown by segment earnings report"
-        results = DDGS().news(keywords=query, region="us-en", safesearch="off", timelimit="y", max_results=5)
+        results = obb_utils.ddgs_news(keywords=query, region="us-en", safesearch="off", timelimit="y", max_results=5)
         return results
     except Exception as e:
         print(f"Error searching revenue segments: {e}")
@@ -575,9 +590,49 @@ def get_historical_data(ticker, period="1y"):
 
 
 
+def _rsi_wilder(close, period):
+    """
+    Wilder-smoothed RSI in a single pass. Mirrors ta.momentum.rsi (fillna=False).
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    alpha = 1.0 / period
+    avg_gain = 0.0
+    avg_loss = 0.0
+    
+    for i in range(n):
+        gain = 0.0
+        loss = 0.0
+        if i > 0:
+            diff = close[i] - close[i - 1]
+            if diff > 0:
+                gain = diff
+            elif diff < 0:
+                loss = -diff
+        
+        if i == 0:
+            avg_gain = gain
+            avg_loss = loss
+        else:
+            avg_gain = (1.0 - alpha) * avg_gain + alpha * gain
+            avg_loss = (1.0 - alpha) * avg_loss + alpha * loss
+        
+        if i >= period - 1:
+            if avg_loss == 0:
+                out[i] = 100.0
+            else:
+                out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return out
+
+if HAS_NUMBA:
+    _rsi_wilder = njit(cache=True)(_rsi_wilder)
+
+
 def calculate_momentum(df):
     """
-    Calculates RSI and Moving Averages using the 'ta' library.
+    Calculates RSI and Moving Averages.
+    RSI uses the numba-compiled recurrence when available, otherwise the 'ta' library.
     """
     if df.empty:
         return df
@@ -587,7 +642,10 @@ def calculate_momentum(df):
     df['SMA_200'] = ta.trend.sma_indicator(df['Close'], window=200)
     
     # RSI
-    df['RSI'] = ta.momentum.rsi(df['Close'], window=14)
+    if HAS_NUMBA:
+        df['RSI'] = _rsi_wilder(df['Close'].to_numpy(dtype=np.float64), 14)
+    else:
+        df['RSI'] = ta.momentum.rsi(df['Close'], window=14)
     
     return df
 
@@ -651,7 +709,7 @@ def get_polymarket_data(ticker_symbol, company_name=None, extra_keywords=None):
                 "closed": "false"
             }
             try:
-                r = requests.get(url, params=params)
+                r = obb_utils.HTTP_SESSION.get(url, params=params, timeout=10)
                 if r.status_code == 200:
                     data = r.json()
                     # /public-search returns {'events': [...]}
@@ -663,15 +721,17 @@ def get_polymarket_data(ticker_symbol, company_name=None, extra_keywords=None):
                 pass
             return []
 
-        # 1. Search by Ticker
-        events_ticker = fetch_and_parse(ticker_symbol)
-        
-        # 2. Search by simple Company Name
-        events_name = []
-        if company_name:
-            simple_name = company_name.split()[0]
-            if simple_name.lower() != ticker_symbol.lower():
-                events_name = fetch_and_parse(simple_name)
+        # 1. Search by Ticker and 2. by simple Company Name (independent, so run in parallel)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            f_ticker = executor.submit(fetch_and_parse, ticker_symbol)
+            f_name = None
+            if company_name:
+                simple_name = company_name.split()[0]
+                if simple_name.lower() != ticker_symbol.lower():
+                    f_name = executor.submit(fetch_and_parse, simple_name)
+            
+            events_ticker = f_ticker.result()
+            events_name = f_name.result() if f_name else []
 
         # Combine & Strict Filter
         for event in events_ticker + events_name: